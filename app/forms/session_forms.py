@@ -1,7 +1,7 @@
 from flask_wtf import FlaskForm
 from wtforms import SelectField, IntegerField, TextAreaField, BooleanField, DateField, SubmitField
 from wtforms.validators import DataRequired, NumberRange, Length, ValidationError, Optional
-from datetime import date, datetime
+from datetime import date
 
 class StartSessionForm(FlaskForm):
     topic_id = SelectField(
@@ -125,10 +125,7 @@ class SessionFilterForm(FlaskForm):
         finish = field.data
         if start is None or finish is None:
             return
-        if isinstance(start, datetime):
-            start = start.date()
-        if isinstance(finish, datetime):
-            finish = finish.date()
-        if finish < start:
+        # toordinal() gives the day number for both date and datetime values
+        if finish.toordinal() < start.toordinal():
             raise ValidationError('End date must be after start date')
 
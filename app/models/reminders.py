@@ -26,6 +26,19 @@ class StudyReminderPreferences:
         self.created_at = created_at
         self.updated_at = updated_at
 
+    @property
+    def days_of_week(self):
+        return self._days_of_week
+
+    @days_of_week.setter
+    def days_of_week(self, days):
+        # Kept as a tuple so the days can only change through this setter, which keeps days_mask in step
+        self._days_of_week = tuple(days or ())
+        # Bit (day - 1) is set for each preferred ISO weekday, so a day check is a single AND
+        self.days_mask = 0
+        for day in self._days_of_week:
+            self.days_mask |= 1 << (int(day) - 1)
+
     @classmethod
     def get_or_create_preferences(cls, user_id: str):
         
@@ -63,7 +76,7 @@ class StudyReminderPreferences:
                 'preferred_times': self.preferred_times,
                 'timezone': self.timezone,
                 'frequency': self.frequency,
-                'days_of_week': self.days_of_week,
+                'days_of_week': list(self.days_of_week),
                 'study_goal_minutes': self.study_goal_minutes,
                 'advance_notice_minutes': self.advance_notice_minutes,
                 'updated_at': datetime.now().isoformat()
@@ -412,6 +425,34 @@ class OptimalStudyTime:
             
         return None
 
+    @classmethod
+    def create_suggestions_bulk(cls, suggestions: List[Dict[str, Any]]):
+        
+        if not SUPABASE_AVAILABLE or not suggestions:
+            return []
+            
+        supabase = get_supabase_client()
+        
+        try:
+            created_at = datetime.now().isoformat()
+            rows = [{
+                'user_id': suggestion['user_id'],
+                'suggested_time': suggestion['suggested_time'].isoformat(),
+                'confidence_score': suggestion['confidence_score'],
+                'reasoning': suggestion['reasoning'],
+                'factors': suggestion.get('factors') or {},
+                'topic_id': suggestion.get('topic_id'),
+                'session_type': suggestion.get('session_type', 'review'),
+                'is_accepted': False,
+                'created_at': created_at
+            } for suggestion in suggestions]
+            
+            result = supabase.table('optimal_study_times').insert(rows).execute()
+            return [cls(**suggestion) for suggestion in result.data]
+        except Exception as e:
+            print(f"Error creating optimal study time suggestions: {e}")
+            return []
+
     @classmethod
     def get_user_suggestions(cls, user_id: str, limit: int = 10):
         
@@ -518,3 +559,17 @@ class StudyPattern:
             
         return None
 
+    @classmethod
+    def pattern_rows(cls, user_id: str, patterns: Dict[str, Dict[str, Any]], sample_size: int) -> List[Dict[str, Any]]:
+        
+        # One study_patterns row per pattern type, upserted on UNIQUE(user_id, pattern_type)
+        last_updated = datetime.now().isoformat()
+        return [{
+            'user_id': user_id,
+            'pattern_type': pattern_type,
+            'pattern_data': pattern_data,
+            'confidence_score': pattern_data.get('confidence', 0.5),
+            'sample_size': sample_size,
+            'last_updated': last_updated
+        } for pattern_type, pattern_data in patterns.items()]
+
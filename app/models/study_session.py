@@ -179,6 +179,24 @@ class StudySession:
             print(f" Error getting sessions from Supabase: {e}")
             raise Exception(f"Failed to retrieve sessions: {e}")
     
+    @staticmethod
+    def get_user_session_rows(user_id, columns, limit=None):
+        
+        # Raw rows holding only the requested columns, for callers that aggregate a few fields
+        client = get_supabase_client()
+        if not SUPABASE_AVAILABLE or not client:
+            sessions = StudySession.get_user_sessions(user_id, limit)
+            return [{column: getattr(session, column, None) for column in columns} for session in sessions]
+
+        try:
+            query = client.table('study_sessions').select(','.join(columns)).eq('user_id', user_id).order('session_date', desc=True)
+            if limit:
+                query = query.limit(limit)
+            return query.execute().data
+        except Exception as e:
+            print(f" Error getting session rows from Supabase: {e}")
+            raise Exception(f"Failed to retrieve sessions: {e}")
+    
     @staticmethod
     def get_topic_sessions(topic_id, user_id):
         
@@ -309,10 +327,11 @@ class StudySession:
         else:
             
             try:
-                global _in_memory_sessions
-                _in_memory_sessions = [session for session in _in_memory_sessions 
-                                     if not (session.id == session_id and session.user_id == user_id)]
-                return True
+                remaining = [session for session in _in_memory_sessions 
+                             if not (session.id == session_id and session.user_id == user_id)]
+                deleted = len(remaining) < len(_in_memory_sessions)
+                _in_memory_sessions[:] = remaining
+                return deleted
             except Exception as e:
                 print(f"Error deleting session from memory: {e}")
                 return False
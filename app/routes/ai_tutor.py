@@ -9,6 +9,9 @@ from app.routes.topics import get_current_user
 from app.utils.ai_tutor import AITutor
 from datetime import datetime
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 ai_tutor = Blueprint('ai_tutor', __name__, url_prefix='/ai-tutor')
 
@@ -31,7 +34,7 @@ def tutor_dashboard():
                              user=user)
     
     except Exception as e:
-        print(f"Error loading AI tutor dashboard: {e}")
+        logger.warning("Error loading AI tutor dashboard", exc_info=True)
         return jsonify({'error': 'Failed to load dashboard'}), 500
 
 @ai_tutor.route('/api/topics')
@@ -51,7 +54,7 @@ def get_topics():
         })
     
     except Exception as e:
-        print(f"Error getting topics: {e}")
+        logger.warning("Error getting topics", exc_info=True)
         return jsonify({'error': 'Failed to get topics'}), 500
 
 @ai_tutor.route('/api/recommendations')
@@ -69,7 +72,7 @@ def get_recommendations():
         return jsonify(recommendations)
     
     except Exception as e:
-        print(f"Error getting recommendations: {e}")
+        logger.warning("Error getting recommendations", exc_info=True)
         return jsonify({'error': 'Failed to get recommendations'}), 500
 
 @ai_tutor.route('/api/study-plan/<topic_id>')
@@ -87,14 +90,14 @@ def generate_study_plan(topic_id):
         target_grade = request.args.get('target_grade')
         time_available = request.args.get('time_available', type=int)
         
-        print(f"Study Plan Debug - Calling generate_study_plan for topic: {topic_id}")
+        logger.debug("Study Plan Debug - Calling generate_study_plan for topic: %s", topic_id)
         study_plan = tutor.generate_study_plan(topic_id, target_grade, time_available)
-        print(f"Study Plan Debug - Study plan generated: {type(study_plan)}")
+        logger.debug("Study Plan Debug - Study plan generated: %s", type(study_plan))
         
         return jsonify(study_plan)
     
     except Exception as e:
-        print(f"Error generating study plan: {e}")
+        logger.warning("Error generating study plan", exc_info=True)
         return jsonify({'error': 'Failed to generate study plan'}), 500
 
 @ai_tutor.route('/api/explain', methods=['POST'])
@@ -107,29 +110,28 @@ def explain_concept():
             return jsonify({'error': 'User not authenticated'}), 401
         
         data = request.get_json()
-        print(f"Concept Explainer Debug - Request data: {data}")
+        logger.debug("Concept Explainer Debug - Request data: %s", data)
         
         concept = data.get('concept', '').strip()
         topic_id = data.get('topic_id')
         explanation_level = data.get('level', 'intermediate')
         
-        print(f"Concept Explainer Debug - Concept: '{concept}', Topic ID: {topic_id}, Level: {explanation_level}")
+        logger.debug("Concept Explainer Debug - Concept: '%s', Topic ID: %s, Level: %s", concept, topic_id, explanation_level)
         
         if not concept:
             return jsonify({'error': 'Concept is required'}), 400
         
         tutor = AITutor(user.id)
-        print(f"Concept Explainer Debug - Calling explain_concept_with_ai...")
+        logger.debug("Concept Explainer Debug - Calling explain_concept_with_ai...")
         explanation = tutor.explain_concept_with_ai(concept, topic_id, explanation_level)
-        print(f"Concept Explainer Debug - Result: {type(explanation)}, Keys: {list(explanation.keys()) if isinstance(explanation, dict) else 'Not dict'}")
-        print(f"Concept Explainer Debug - Activity tracking should have been called")
+        logger.debug("Concept Explainer Debug - Result: %s, Keys: %s", type(explanation),
+                     list(explanation.keys()) if isinstance(explanation, dict) else 'Not dict')
+        logger.debug("Concept Explainer Debug - Activity tracking should have been called")
         
         return jsonify(explanation)
     
     except Exception as e:
-        print(f"Error explaining concept: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.warning("Error explaining concept", exc_info=True)
         return jsonify({'error': f'Failed to explain concept: {str(e)}'}), 500
 
 @ai_tutor.route('/api/predict-grade/<topic_id>')
@@ -151,7 +153,7 @@ def predict_grade(topic_id):
         return jsonify(prediction)
     
     except Exception as e:
-        print(f"Error predicting grade: {e}")
+        logger.warning("Error predicting grade", exc_info=True)
         return jsonify({'error': 'Failed to predict grade'}), 500
 
 @ai_tutor.route('/api/learning-style')
@@ -169,7 +171,7 @@ def detect_learning_style():
         return jsonify(learning_style)
     
     except Exception as e:
-        print(f"Error detecting learning style: {e}")
+        logger.warning("Error detecting learning style", exc_info=True)
         return jsonify({'error': 'Failed to detect learning style'}), 500
 
 @ai_tutor.route('/api/adaptive-quiz/<topic_id>')
@@ -181,24 +183,23 @@ def get_adaptive_quiz_recommendations(topic_id):
         if not user:
             return jsonify({'error': 'User not authenticated'}), 401
         
-        print(f"Adaptive Quiz Debug - Topic ID: {topic_id}, User: {user.id}")
+        logger.debug("Adaptive Quiz Debug - Topic ID: %s, User: %s", topic_id, user.id)
         
         tutor = AITutor(user.id)
         recommendations = tutor.get_adaptive_quiz_recommendations(topic_id)
         
-        print(f"Adaptive Quiz Debug - Result type: {type(recommendations)}")
-        print(f"Adaptive Quiz Debug - Result keys: {list(recommendations.keys()) if isinstance(recommendations, dict) else 'Not dict'}")
+        logger.debug("Adaptive Quiz Debug - Result type: %s", type(recommendations))
+        logger.debug("Adaptive Quiz Debug - Result keys: %s",
+                     list(recommendations.keys()) if isinstance(recommendations, dict) else 'Not dict')
         if 'recommendations' in recommendations:
-            print(f"Adaptive Quiz Debug - Recommendations count: {len(recommendations['recommendations'])}")
+            logger.debug("Adaptive Quiz Debug - Recommendations count: %s", len(recommendations['recommendations']))
             if recommendations['recommendations']:
-                print(f"Adaptive Quiz Debug - First recommendation: {recommendations['recommendations'][0]}")
+                logger.debug("Adaptive Quiz Debug - First recommendation: %s", recommendations['recommendations'][0])
         
         return jsonify(recommendations)
     
     except Exception as e:
-        print(f"Error getting adaptive quiz recommendations: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.warning("Error getting adaptive quiz recommendations", exc_info=True)
         return jsonify({'error': f'Failed to get quiz recommendations: {str(e)}'}), 500
 
 @ai_tutor.route('/api/activity')
@@ -210,12 +211,12 @@ def get_ai_activity():
         if not user:
             return jsonify({'error': 'User not authenticated'}), 401
         
-        print(f"AI Activity Debug - User ID: {user.id}")
+        logger.debug("AI Activity Debug - User ID: %s", user.id)
         
         from app.models import AIActivity
         activities = AIActivity.get_recent_activity(user.id, limit=10)
         
-        print(f"AI Activity Debug - Retrieved {len(activities)} activities")
+        logger.debug("AI Activity Debug - Retrieved %s activities", len(activities))
         
         # Convert activities to JSON-serializable format
         activity_data = []
@@ -233,10 +234,10 @@ def get_ai_activity():
                     'time_ago': activity.get_time_ago()
                 })
             except Exception as activity_error:
-                print(f"Error processing activity {activity.id}: {activity_error}")
+                logger.warning("Error processing activity %s", activity.id, exc_info=True)
                 continue
         
-        print(f"AI Activity Debug - Returning {len(activity_data)} processed activities")
+        logger.debug("AI Activity Debug - Returning %s processed activities", len(activity_data))
         
         return jsonify({
             'activities': activity_data,
@@ -244,9 +245,7 @@ def get_ai_activity():
         })
     
     except Exception as e:
-        print(f"Error getting AI activity: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.warning("Error getting AI activity", exc_info=True)
         return jsonify({'error': f'Failed to get AI activity: {str(e)}'}), 500
 
 @ai_tutor.route('/chat')
@@ -262,9 +261,7 @@ def tutor_chat():
         return render_template('ai_tutor/chat.html', user=user)
     
     except Exception as e:
-        print(f"Error loading chat interface: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.warning("Error loading chat interface", exc_info=True)
         flash('Error loading chat interface. Please try again.', 'error')
         return redirect(url_for('ai_tutor.tutor_dashboard'))
 
@@ -296,7 +293,7 @@ def tutor_chat_api():
         })
     
     except Exception as e:
-        print(f"Error in tutor chat: {e}")
+        logger.warning("Error in tutor chat", exc_info=True)
         return jsonify({'error': 'Failed to process chat message'}), 500
 
 @ai_tutor.route('/api/save-learning-style', methods=['POST'])
@@ -369,7 +366,5 @@ def save_learning_style():
             return jsonify({'error': 'Failed to save learning style'}), 500
     
     except Exception as e:
-        print(f"Error saving learning style: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.warning("Error saving learning style", exc_info=True)
         return jsonify({'error': f'Failed to save learning style: {str(e)}'}), 500
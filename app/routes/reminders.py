@@ -208,15 +208,14 @@ def smart_schedule():
         
         
         scheduling_engine = SmartSchedulingEngine()
-        optimal_times = scheduling_engine.suggest_optimal_study_times(user.id, days_ahead=7)
+        # The page shows the patterns too, so analyze once and let the suggestions reuse them
+        patterns = scheduling_engine.analyze_study_patterns(user.id)
+        optimal_times = scheduling_engine.suggest_optimal_study_times(user.id, days_ahead=7, patterns=patterns)
         
         
         from app.models import Topic
         topics = Topic.get_all_by_user(user.id)
         
-        
-        patterns = scheduling_engine.analyze_study_patterns(user.id)
-        
         return render_template('reminders/smart_schedule.html',
                              optimal_times=optimal_times,
                              topics=topics,
@@ -0,0 +1,10 @@
+"""
+Shared worker pool for blocking AI and database I/O
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+CONTENT_GEN_POOL_SIZE = int(os.getenv('CONTENT_GEN_POOL', '20'))
+
+ai_executor = ThreadPoolExecutor(max_workers=CONTENT_GEN_POOL_SIZE, thread_name_prefix='ai-io')
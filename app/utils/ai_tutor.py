@@ -3,17 +3,181 @@ Advanced AI Tutor System
 Enhanced AI-powered study companion with personalized recommendations
 """
 
-import openai
-import os
-import json
+import re
+import copy
+import logging
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Tuple
 from app.models import get_supabase_client, SUPABASE_AVAILABLE
 from app.models.quiz import QuizAttempt
 from app.models import Topic
-from dotenv import load_dotenv
+from app.utils import bg_queue
+from app.utils.ai_executor import ai_executor
+from app.utils.llm_cache import TTLCache, llm_cache, llm_inflight, make_cache_key
+from app.utils.openai_client import OPENAI_MODEL, get_openai_client
+from app.utils.openai_limiter import openai_limiter, estimate_tokens
+from app.utils.prompt_text import parse_json_object, truncate_for_prompt
+
+logger = logging.getLogger(__name__)
+
+AI_UNAVAILABLE_MESSAGE = 'AI service not available. Please check your OpenAI API key.'
+
+# Study patterns drive learning-style detection and shift over days, not minutes
+STUDY_PATTERN_CACHE_TTL_SECONDS = 300
+STUDY_PATTERN_CACHE_MAX_USERS = 1024
+
+_study_pattern_cache = TTLCache(ttl=STUDY_PATTERN_CACHE_TTL_SECONDS, max_entries=STUDY_PATTERN_CACHE_MAX_USERS)
+
+_CONFIDENCE_RE = re.compile(r'(\d+)%')
+
+# Returned (as copies) whenever study data or the AI service is unavailable
+DEFAULT_STUDY_PATTERNS = {
+    'total_sessions': 0,
+    'average_duration': 30,
+    'preferred_times': ['morning'],
+    'content_preferences': ['text'],
+    'performance_patterns': 'stable',
+    'study_consistency': 'low',
+    'total_topics': 0,
+    'session_types': ['study'],
+    'confidence_trends': 'stable'
+}
+
+DEFAULT_LEARNING_STYLE = {
+    'style': 'visual',
+    'confidence': 75,
+    'recommendations': [
+        'Use visual aids like diagrams and charts',
+        'Create mind maps for complex topics',
+        'Watch educational videos',
+        'Use color coding in your notes',
+        'Practice with visual flashcards'
+    ],
+    'explanation': 'Based on your study patterns, you appear to be a visual learner who benefits from visual representations of information.'
+}
+
+
+# Prompt templates keep the static instructions first and the per-request data last,
+# so identical prefixes are byte-for-byte stable across users and calls
+RECOMMENDATION_PROMPT = """As an AI study tutor, analyze this student's learning data and provide personalized recommendations.
+
+Provide specific, actionable recommendations in JSON format:
+{{
+    "study_schedule": "recommendation for when to study",
+    "quiz_practice": "recommendation for quiz frequency",
+    "topic_review": "recommendation for reviewing topics",
+    "improvement_areas": ["specific areas to focus on"],
+    "motivation_tips": ["encouraging tips"],
+    "next_steps": ["immediate actions to take"]
+}}
+
+Study Data:
+- Total study time: {total_study_time_hours} hours
+- Average session length: {avg_session_length_minutes} minutes
+- Quizzes taken: {total_quizzes_taken}
+- Average quiz score: {avg_quiz_score}%
+- Study consistency: {study_consistency}
+- Topics studied: {total_topics}
+"""
+
+STUDY_PLAN_PROMPT = """Create a comprehensive, personalized study plan for the topic below.
+
+Please create a detailed study plan that includes:
+1. Weekly study schedule with specific time allocations
+2. Learning objectives and milestones
+3. Study methods and techniques
+4. Practice activities and exercises
+5. Assessment and review strategies
+6. Timeline for achieving the target grade
+
+Format the response as a structured study plan with clear sections and actionable steps.
+
+Topic: "{title}"
+Topic Description: {description}
+Current Performance: {performance}
+Target Grade: {target_grade}
+Time Available: {time_available} hours per week
+"""
+
+EXPLANATION_PROMPT = """Explain the concept below in detail, pitched at the requested explanation level.
+
+Explanation levels:
+- Beginner: Use simple language, basic examples, and fundamental concepts
+- Intermediate: Include some technical terms, practical examples, and connections to other concepts
+- Advanced: Use precise terminology, complex examples, and deep theoretical understanding
+
+Please provide:
+1. A clear, comprehensive explanation of the concept
+2. Practical examples that illustrate the concept
+3. Related concepts that connect to this topic
+4. Analogies or comparisons to help understanding
+
+Make the explanation engaging and educational, suitable for the requested level.
+
+Concept: "{concept}"
+Context: {context}
+Explanation Level: {level}
+"""
+
+ADAPTIVE_QUIZ_PROMPT = """Analyze this student's learning data and provide personalized quiz recommendations for their specific topic.
+
+Please provide specific quiz recommendations that are directly related to the topic below. Include:
+1. Quiz type and focus area (specific to the topic)
+2. Difficulty level
+3. Estimated time required
+4. Learning objectives (topic-specific)
+5. Specific subtopics within the main topic to focus on
+
+Make sure all recommendations are directly relevant to the topic. Format your response as structured recommendations that will help the student improve their understanding of this specific topic.
+
+{topic_context}Current Performance: {performance}
+Identified Weak Areas: {weak_areas}
+"""
+
+ADAPTIVE_QUIZ_TOPIC_CONTEXT = """Topic: {title}
+Description: {description}
+Subject Area: {subject}
+"""
+
+CHAT_PROMPT = """You are an expert AI tutor specializing in personalized education. Help the student with their question.
+
+Please provide a helpful, educational response that:
+1. Directly answers their question
+2. Provides additional learning insights
+3. Suggests related topics or follow-up questions
+4. Uses appropriate difficulty level for the student
+5. Encourages further learning
+
+Keep your response conversational and supportive.
+
+{topic_context}Previous conversation context: {context}
+
+Student's question: {message}
+"""
+
+LEARNING_STYLE_PROMPT = """Analyze the study patterns below to determine the user's learning style.
+
+Determine the primary learning style and provide:
+1. Primary learning style (visual, auditory, kinesthetic, reading_writing, or multimodal)
+2. Confidence level (0-100%)
+3. 3-5 personalized study recommendations
+4. Brief explanation of why this style was chosen
+
+Return the response in JSON format with keys: style, confidence, recommendations, explanation.
+
+Study Patterns:
+- Total Sessions: {total_sessions}
+- Total Topics: {total_topics}
+- Average Duration: {average_duration:.1f} minutes
+- Preferred Study Times: {preferred_times}
+- Content Preferences: {content_preferences}
+- Session Types: {session_types}
+- Performance Patterns: {performance_patterns}
+- Confidence Trends: {confidence_trends}
+- Study Consistency: {study_consistency}
+"""
 
-load_dotenv()
 
 class AITutor:
     """Advanced AI-powered study companion"""
@@ -21,21 +185,60 @@ class AITutor:
     def __init__(self, user_id: str):
         self.user_id = user_id
         self.client = self._get_openai_client()
+        self._ai_available = self.client is not None
         self.supabase = get_supabase_client() if SUPABASE_AVAILABLE else None
+        self._topic_cache = {}
     
     def _get_openai_client(self):
-        """Get OpenAI client with error handling"""
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
-            return None
-        try:
-            return openai.OpenAI(api_key=api_key)
-        except Exception as e:
-            print(f"Error initializing OpenAI client: {e}")
-            return None
+        """Get the shared OpenAI client, or None when AI is not configured"""
+        return get_openai_client()
+    
+    def _get_topic(self, topic_id: str):
+        """Fetch a topic once per tutor instance; several helpers need it within one request"""
+        if topic_id not in self._topic_cache:
+            self._topic_cache[topic_id] = Topic.get_by_id(topic_id, self.user_id)
+        return self._topic_cache[topic_id]
+    
+    def _chat(self, system: str, prompt: str, max_tokens: int, temperature: float = 0.7,
+              json_mode: bool = False) -> str:
+        """Run a chat completion, serving repeated identical requests from the LLM cache"""
+        cache_key = make_cache_key(OPENAI_MODEL, system, prompt, max_tokens, temperature, json_mode)
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        def complete() -> str:
+            # The previous caller for this key may have finished between the lookup and now
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            options = {}
+            if json_mode:
+                # The API requires the word "JSON" somewhere in the messages for this mode
+                options['response_format'] = {"type": "json_object"}
+            with openai_limiter.reserve(tokens=estimate_tokens(system + prompt, max_tokens)):
+                response = self.client.chat.completions.create(
+                    model=OPENAI_MODEL,
+                    messages=[
+                        {"role": "system", "content": system},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    **options
+                )
+            content = response.choices[0].message.content.strip()
+            llm_cache.set(cache_key, content)
+            return content
+        
+        # Identical requests already in flight share one API call instead of each missing the cache
+        return llm_inflight.do(cache_key, complete)
     
     def get_personalized_study_recommendations(self) -> Dict:
         """Get personalized study recommendations based on user's learning patterns"""
+        if not self._ai_available:
+            return self._get_default_recommendations()
+        
         try:
             # Get user's learning data
             learning_data = self._get_user_learning_data()
@@ -49,24 +252,29 @@ class AITutor:
             # Get AI recommendations
             recommendations = self._call_ai_for_recommendations(prompt)
             
+            generated_at = datetime.now().isoformat()
+            
             # Save recommendations for tracking
-            self._save_recommendations(recommendations)
+            self._save_recommendations(recommendations, created_at=generated_at)
             
             return {
                 'recommendations': recommendations,
                 'data_analysis': learning_data['summary'],
-                'timestamp': datetime.now().isoformat()
+                'timestamp': generated_at
             }
             
         except Exception as e:
-            print(f"Error getting personalized recommendations: {e}")
+            logger.exception("Error getting personalized recommendations")
             return self._get_default_recommendations()
     
     def generate_study_plan(self, topic_id: str, target_grade: str = None, time_available: int = None) -> Dict:
         """Generate a personalized study plan for a specific topic"""
+        if not self._ai_available:
+            return {'error': AI_UNAVAILABLE_MESSAGE}
+        
         try:
 
-            topic = Topic.get_topic_by_id(topic_id, self.user_id)
+            topic = self._get_topic(topic_id)
             if not topic:
                 return {'error': 'Topic not found'}
             
@@ -101,18 +309,21 @@ class AITutor:
             }
             
         except Exception as e:
-            print(f"Error generating study plan: {e}")
+            logger.exception("Error generating study plan")
             return {'error': 'Failed to generate study plan'}
     
     def explain_concept_with_ai(self, concept: str, topic_id: str = None, explanation_level: str = 'intermediate') -> Dict:
         """Enhanced concept explanation with adaptive difficulty"""
+        if not self._ai_available:
+            return {'error': AI_UNAVAILABLE_MESSAGE}
+        
         try:
             # Get topic context if provided
             topic_context = ""
             if topic_id:
-                topic = Topic.get_topic_by_id(topic_id, self.user_id)
+                topic = self._get_topic(topic_id)
                 if topic:
-                    topic_context = f"Topic: {topic.title}\nDescription: {topic.description}"
+                    topic_context = f"Topic: {topic.title}\nDescription: {truncate_for_prompt(topic.description)}"
             
             # Get user's learning style and preferences
             learning_profile = self._get_user_learning_profile()
@@ -144,7 +355,7 @@ class AITutor:
             }
             
         except Exception as e:
-            print(f"Error explaining concept: {e}")
+            logger.exception("Error explaining concept")
             return {'error': 'Failed to explain concept'}
     
     def predict_grade(self, topic_id: str, exam_date: str = None) -> Dict:
@@ -187,11 +398,14 @@ class AITutor:
             }
             
         except Exception as e:
-            print(f"Error predicting grade: {e}")
+            logger.exception("Error predicting grade")
             return {'error': 'Failed to predict grade'}
     
     def detect_learning_style(self) -> Dict:
         """Detect user's learning style based on their study patterns"""
+        if not self._ai_available:
+            return {'error': AI_UNAVAILABLE_MESSAGE}
+        
         try:
             # Analyze user's study patterns
             study_patterns = self._analyze_study_patterns()
@@ -202,62 +416,66 @@ class AITutor:
             # Get AI analysis
             learning_style = self._call_ai_for_learning_style(prompt)
             
+            generated_at = datetime.now().isoformat()
+            
             # Save learning style
-            self._save_learning_style(learning_style)
+            self._save_learning_style(learning_style, created_at=generated_at)
             
             return {
                 'learning_style': learning_style,
                 'confidence': learning_style.get('confidence', 0),
                 'recommendations': learning_style.get('recommendations', []),
                 'study_patterns': study_patterns,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': generated_at
             }
             
         except Exception as e:
-            print(f"Error detecting learning style: {e}")
+            logger.exception("Error detecting learning style")
             return {'error': 'Failed to detect learning style'}
     
     def get_adaptive_quiz_recommendations(self, topic_id: str) -> Dict:
         """Get adaptive quiz recommendations based on user's performance"""
+        if not self._ai_available:
+            return {'error': AI_UNAVAILABLE_MESSAGE}
+        
         try:
-            print(f"Adaptive Quiz Debug - Starting recommendations for topic: {topic_id}")
+            logger.debug("Adaptive Quiz Debug - Starting recommendations for topic: %s", topic_id)
             
 
-            print(f"Adaptive Quiz Debug - Fetching topic information...")
-            from app.models import Topic
-            topic = Topic.get_by_id(topic_id, self.user_id)
+            logger.debug("Adaptive Quiz Debug - Fetching topic information...")
+            topic = self._get_topic(topic_id)
             if not topic:
-                print(f"Adaptive Quiz Debug - Topic not found, using fallback")
+                logger.debug("Adaptive Quiz Debug - Topic not found, using fallback")
                 topic = None
             else:
-                print(f"Adaptive Quiz Debug - Topic found: {topic.title}")
+                logger.debug("Adaptive Quiz Debug - Topic found: %s", topic.title)
             
 
-            print(f"Adaptive Quiz Debug - Getting topic performance...")
+            logger.debug("Adaptive Quiz Debug - Getting topic performance...")
             performance = self._get_topic_performance(topic_id)
-            print(f"Adaptive Quiz Debug - Performance: {performance}")
+            logger.debug("Adaptive Quiz Debug - Performance: %s", performance)
             
 
-            print(f"Adaptive Quiz Debug - Identifying weak areas...")
+            logger.debug("Adaptive Quiz Debug - Identifying weak areas...")
             weak_areas = self._identify_weak_areas(topic_id)
-            print(f"Adaptive Quiz Debug - Weak areas: {weak_areas}")
+            logger.debug("Adaptive Quiz Debug - Weak areas: %s", weak_areas)
             
 
-            print(f"Adaptive Quiz Debug - Building prompt...")
+            logger.debug("Adaptive Quiz Debug - Building prompt...")
             prompt = self._build_adaptive_quiz_prompt(performance, weak_areas, topic)
-            print(f"Adaptive Quiz Debug - Prompt length: {len(prompt)}")
+            logger.debug("Adaptive Quiz Debug - Prompt length: %s", len(prompt))
             
 
-            print(f"Adaptive Quiz Debug - Calling AI...")
+            logger.debug("Adaptive Quiz Debug - Calling AI...")
             recommendations = self._call_ai_for_adaptive_quiz(prompt)
-            print(f"Adaptive Quiz Debug - AI response type: {type(recommendations)}")
-            print(f"Adaptive Quiz Debug - AI response keys: {list(recommendations.keys()) if isinstance(recommendations, dict) else 'Not dict'}")
+            logger.debug("Adaptive Quiz Debug - AI response type: %s", type(recommendations))
+            logger.debug("Adaptive Quiz Debug - AI response keys: %s", list(recommendations.keys()) if isinstance(recommendations, dict) else 'Not dict')
             
 
             if isinstance(recommendations, dict) and 'recommendations' in recommendations:
                 rec_list = recommendations['recommendations']
             else:
-                print(f"Adaptive Quiz Debug - No recommendations found, creating fallback")
+                logger.debug("Adaptive Quiz Debug - No recommendations found, creating fallback")
                 rec_list = [{
                     'quiz_type': 'General Practice',
                     'recommendation': 'Focus on fundamental concepts and practice problems',
@@ -279,13 +497,11 @@ class AITutor:
                 'topic_title': topic.title if topic else 'Unknown Topic'
             }, f"Generated {len(rec_list)} quiz recommendations for {topic.title if topic else 'selected topic'}")
             
-            print(f"Adaptive Quiz Debug - Final result: {result}")
+            logger.debug("Adaptive Quiz Debug - Final result: %s", result)
             return result
             
         except Exception as e:
-            print(f"Error getting adaptive quiz recommendations: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error getting adaptive quiz recommendations")
             return {'error': f'Failed to get quiz recommendations: {str(e)}'}
     
 
@@ -295,14 +511,22 @@ class AITutor:
             return None
         
         try:
-            # Get recent study sessions
-            sessions = self.supabase.table('study_sessions').select('*').eq('user_id', self.user_id).gte('session_date', (datetime.now() - timedelta(days=30)).isoformat()).execute()
+            since = (datetime.now() - timedelta(days=30)).isoformat()
             
-            # Get quiz attempts
-            quiz_attempts = self.supabase.table('quiz_attempts').select('*').eq('user_id', self.user_id).gte('created_at', (datetime.now() - timedelta(days=30)).isoformat()).execute()
+            # The three reads are independent, so overlap their round trips on the shared pool
+            sessions_future = ai_executor.submit(
+                self.supabase.table('study_sessions').select('*').eq('user_id', self.user_id).gte('session_date', since).execute
+            )
+            quiz_attempts_future = ai_executor.submit(
+                self.supabase.table('quiz_attempts').select('*').eq('user_id', self.user_id).gte('created_at', since).execute
+            )
+            topics_future = ai_executor.submit(
+                self.supabase.table('topics').select('*').eq('user_id', self.user_id).eq('is_active', True).execute
+            )
             
-            # Get topics
-            topics = self.supabase.table('topics').select('*').eq('user_id', self.user_id).eq('is_active', True).execute()
+            sessions = sessions_future.result()
+            quiz_attempts = quiz_attempts_future.result()
+            topics = topics_future.result()
             
             return {
                 'sessions': sessions.data if sessions.data else [],
@@ -312,7 +536,7 @@ class AITutor:
             }
             
         except Exception as e:
-            print(f"Error getting user learning data: {e}")
+            logger.exception("Error getting user learning data")
             return None
     
     def _analyze_learning_data(self, sessions: List, quiz_attempts: List, topics: List) -> Dict:
@@ -368,29 +592,14 @@ class AITutor:
     def _build_recommendation_prompt(self, learning_data: Dict) -> str:
         """Build prompt for personalized recommendations"""
         data = learning_data['summary']
-        
-        prompt = f"""
-        As an AI study tutor, analyze this student's learning data and provide personalized recommendations:
-        
-        Study Data:
-        - Total study time: {data['total_study_time_hours']} hours
-        - Average session length: {data['avg_session_length_minutes']} minutes
-        - Quizzes taken: {data['total_quizzes_taken']}
-        - Average quiz score: {data['avg_quiz_score']}%
-        - Study consistency: {data['study_consistency']}
-        - Topics studied: {data['total_topics']}
-        
-        Provide specific, actionable recommendations in JSON format:
-        {{
-            "study_schedule": "recommendation for when to study",
-            "quiz_practice": "recommendation for quiz frequency",
-            "topic_review": "recommendation for reviewing topics",
-            "improvement_areas": ["specific areas to focus on"],
-            "motivation_tips": ["encouraging tips"],
-            "next_steps": ["immediate actions to take"]
-        }}
-        """
-        return prompt
+        return RECOMMENDATION_PROMPT.format(
+            total_study_time_hours=data['total_study_time_hours'],
+            avg_session_length_minutes=data['avg_session_length_minutes'],
+            total_quizzes_taken=data['total_quizzes_taken'],
+            avg_quiz_score=data['avg_quiz_score'],
+            study_consistency=data['study_consistency'],
+            total_topics=data['total_topics']
+        )
     
     def _call_ai_for_recommendations(self, prompt: str) -> Dict:
         """Call AI for personalized recommendations"""
@@ -398,43 +607,39 @@ class AITutor:
             return self._get_default_recommendations()['recommendations']
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert AI study tutor. Provide personalized, actionable study recommendations based on learning data. Always respond with valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
+            content = self._chat(
+                "You are an expert AI study tutor. Provide personalized, actionable study recommendations based on learning data. Always respond with valid JSON.",
+                prompt,
                 max_tokens=500,
-                temperature=0.7
+                json_mode=True
             )
-            
-            content = response.choices[0].message.content.strip()
-            return json.loads(content)
+            recommendations = parse_json_object(content)
+            if recommendations is None:
+                logger.warning("AI recommendations reply contained no JSON object")
+                return self._get_default_recommendations()['recommendations']
+            return recommendations
             
         except Exception as e:
-            print(f"Error calling AI for recommendations: {e}")
+            logger.exception("Error calling AI for recommendations")
             return self._get_default_recommendations()['recommendations']
     
-    def _save_recommendations(self, recommendations: Dict):
+    def _save_recommendations(self, recommendations: Dict, created_at: str = None):
         """Save recommendations to database"""
         if not self.supabase:
             return
         
-        try:
-            self.supabase.table('ai_recommendations').insert({
-                'user_id': self.user_id,
-                'recommendations': json.dumps(recommendations),
-                'created_at': datetime.now().isoformat()
-            }).execute()
-        except Exception as e:
-            print(f"Error saving recommendations: {e}")
+        # Nothing reads the row back during this request, so write it off the request thread
+        bg_queue.put('ai_recommendations', {
+            'user_id': self.user_id,
+            'recommendations': recommendations,
+            'created_at': created_at or datetime.now().isoformat()
+        })
     
     # Additional helper methods would be implemented here...
     def _get_topic_performance(self, topic_id: str) -> Dict:
         """Get performance data for a specific topic"""
         try:
-            from app.models import Topic
-            topic = Topic.get_by_id(topic_id, self.user_id)
+            topic = self._get_topic(topic_id)
             if topic:
 
                 topic_lower = topic.title.lower()
@@ -481,31 +686,18 @@ class AITutor:
             else:
                 return {'score': 75, 'time_spent': 120, 'difficulty': 'medium'}
         except Exception as e:
-            print(f"Error getting topic performance: {e}")
+            logger.exception("Error getting topic performance")
             return {'score': 75, 'time_spent': 120, 'difficulty': 'medium'}
     
     def _build_study_plan_prompt(self, topic, performance, target_grade, time_available) -> str:
         """Build prompt for study plan generation"""
-        prompt = f"""
-Create a comprehensive, personalized study plan for the topic: "{topic.title}"
-
-Topic Description: {topic.description[:200]}...
-
-Current Performance: {performance}
-Target Grade: {target_grade if target_grade else 'Not specified'}
-Time Available: {time_available} hours per week
-
-Please create a detailed study plan that includes:
-1. Weekly study schedule with specific time allocations
-2. Learning objectives and milestones
-3. Study methods and techniques
-4. Practice activities and exercises
-5. Assessment and review strategies
-6. Timeline for achieving the target grade
-
-Format the response as a structured study plan with clear sections and actionable steps.
-"""
-        return prompt
+        return STUDY_PLAN_PROMPT.format(
+            title=topic.title,
+            description=truncate_for_prompt(topic.description, 200),
+            performance=performance,
+            target_grade=target_grade if target_grade else 'Not specified',
+            time_available=time_available
+        )
     
     def _call_ai_for_study_plan(self, prompt: str) -> Dict:
         """Call AI for study plan generation"""
@@ -516,23 +708,17 @@ Format the response as a structured study plan with clear sections and actionabl
             }
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert educational tutor specializing in creating personalized study plans. Provide detailed, actionable study plans with specific activities, timelines, and learning strategies."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1000,
-                temperature=0.7
+            ai_response = self._chat(
+                "You are an expert educational tutor specializing in creating personalized study plans. Provide detailed, actionable study plans with specific activities, timelines, and learning strategies.",
+                prompt,
+                max_tokens=1000
             )
             
-            ai_response = response.choices[0].message.content
-            
 
             return self._parse_study_plan_response(ai_response)
             
         except Exception as e:
-            print(f"Error calling AI for study plan: {e}")
+            logger.exception("Error calling AI for study plan")
             return {
                 'plan': f'Error generating study plan: {str(e)}',
                 'error': str(e)
@@ -594,7 +780,7 @@ Format the response as a structured study plan with clear sections and actionabl
             return structured_plan
             
         except Exception as e:
-            print(f"Error parsing study plan response: {e}")
+            logger.exception("Error parsing study plan response")
             return {
                 'full_text': ai_response,
                 'overview': ai_response,
@@ -612,25 +798,11 @@ Format the response as a structured study plan with clear sections and actionabl
     
     def _build_explanation_prompt(self, concept, topic_context, level, profile) -> str:
         """Build explanation prompt"""
-        prompt = f"""
-Explain the concept "{concept}" in detail.
-
-Context: {topic_context if topic_context else 'No specific topic context provided'}
-
-Explanation Level: {level}
-- Beginner: Use simple language, basic examples, and fundamental concepts
-- Intermediate: Include some technical terms, practical examples, and connections to other concepts
-- Advanced: Use precise terminology, complex examples, and deep theoretical understanding
-
-Please provide:
-1. A clear, comprehensive explanation of the concept
-2. Practical examples that illustrate the concept
-3. Related concepts that connect to this topic
-4. Analogies or comparisons to help understanding
-
-Make the explanation engaging and educational, suitable for the {level} level.
-"""
-        return prompt
+        return EXPLANATION_PROMPT.format(
+            concept=concept,
+            context=topic_context if topic_context else 'No specific topic context provided',
+            level=level
+        )
     
     def _call_ai_for_explanation(self, prompt: str) -> Dict:
         """Call AI for explanation"""
@@ -643,23 +815,17 @@ Make the explanation engaging and educational, suitable for the {level} level.
             }
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert educational tutor specializing in explaining complex concepts in simple, understandable terms. Provide clear explanations with examples, analogies, and related concepts. Structure your response to be educational and engaging."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=800,
-                temperature=0.7
+            ai_response = self._chat(
+                "You are an expert educational tutor specializing in explaining complex concepts in simple, understandable terms. Provide clear explanations with examples, analogies, and related concepts. Structure your response to be educational and engaging.",
+                prompt,
+                max_tokens=800
             )
             
-            ai_response = response.choices[0].message.content
-            
             # Parse the AI response into structured format
             return self._parse_explanation_response(ai_response)
             
         except Exception as e:
-            print(f"Error calling AI for explanation: {e}")
+            logger.exception("Error calling AI for explanation")
             return {
                 'explanation': f'Error generating explanation: {str(e)}',
                 'examples': '',
@@ -722,7 +888,7 @@ Make the explanation engaging and educational, suitable for the {level} level.
             return structured_explanation
             
         except Exception as e:
-            print(f"Error parsing explanation response: {e}")
+            logger.exception("Error parsing explanation response")
             return {
                 'explanation': ai_response,
                 'examples': '',
@@ -795,7 +961,7 @@ Make the explanation engaging and educational, suitable for the {level} level.
             }
             
         except Exception as e:
-            print(f"Error parsing adaptive quiz response: {e}")
+            logger.exception("Error parsing adaptive quiz response")
             return {
                 'recommendations': [{
                     'quiz_type': 'General Practice',
@@ -809,10 +975,10 @@ Make the explanation engaging and educational, suitable for the {level} level.
                           activity_data: Dict = None, result_summary: str = None):
         """Track AI activity for the user"""
         try:
-            print(f"AI Activity Debug - Tracking activity: {activity_type} for user {self.user_id}")
-            print(f"AI Activity Debug - Topic ID: {topic_id}")
-            print(f"AI Activity Debug - Activity data: {activity_data}")
-            print(f"AI Activity Debug - Result summary: {result_summary}")
+            logger.debug("AI Activity Debug - Tracking activity: %s for user %s", activity_type, self.user_id)
+            logger.debug("AI Activity Debug - Topic ID: %s", topic_id)
+            logger.debug("AI Activity Debug - Activity data: %s", activity_data)
+            logger.debug("AI Activity Debug - Result summary: %s", result_summary)
             
             from app.models import AIActivity
             result = AIActivity.create_activity(
@@ -824,15 +990,13 @@ Make the explanation engaging and educational, suitable for the {level} level.
             )
             
             if result:
-                print(f"AI Activity Debug - Activity created successfully: {result.id}")
+                logger.debug("AI Activity Debug - Activity created successfully: %s", result.id)
             else:
-                print(f"AI Activity Debug - Activity creation returned None")
+                logger.debug("AI Activity Debug - Activity creation returned None")
                 
-            print(f"AI Activity tracked: {activity_type} for user {self.user_id}")
+            logger.debug("AI Activity tracked: %s for user %s", activity_type, self.user_id)
         except Exception as e:
-            print(f"Error tracking AI activity: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error tracking AI activity")
     
     def _enhanced_chat(self, message: str, context: str = '', topic_id: str = None) -> str:
         """Enhanced AI chat with learning context"""
@@ -843,41 +1007,22 @@ Make the explanation engaging and educational, suitable for the {level} level.
 
             topic_context = ""
             if topic_id:
-                from app.models import Topic
-                topic = Topic.get_by_id(topic_id, self.user_id)
+                topic = self._get_topic(topic_id)
                 if topic:
-                    topic_context = f"Topic: {topic.title}\nDescription: {topic.description}\n"
+                    topic_context = f"Topic: {topic.title}\nDescription: {truncate_for_prompt(topic.description)}\n"
             
 
-            prompt = f"""
-You are an expert AI tutor specializing in personalized education. Help the student with their question.
-
-{topic_context}
-Previous conversation context: {context}
-
-Student's question: {message}
-
-Please provide a helpful, educational response that:
-1. Directly answers their question
-2. Provides additional learning insights
-3. Suggests related topics or follow-up questions
-4. Uses appropriate difficulty level for the student
-5. Encourages further learning
-
-Keep your response conversational and supportive.
-"""
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert AI tutor specializing in personalized education. Provide helpful, educational responses that encourage learning."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=500,
-                temperature=0.7
+            prompt = CHAT_PROMPT.format(
+                topic_context=topic_context,
+                context=context,
+                message=message
             )
             
-            ai_response = response.choices[0].message.content
+            ai_response = self._chat(
+                "You are an expert AI tutor specializing in personalized education. Provide helpful, educational responses that encourage learning.",
+                prompt,
+                max_tokens=500
+            )
             
 
             self._track_ai_activity('chat', topic_id, {
@@ -888,7 +1033,7 @@ Keep your response conversational and supportive.
             return ai_response
             
         except Exception as e:
-            print(f"Error in enhanced chat: {e}")
+            logger.exception("Error in enhanced chat")
             return "I'm sorry, I encountered an error while processing your message. Please try again."
     
     def _get_recent_quiz_scores(self, topic_id: str) -> List:
@@ -930,8 +1075,7 @@ Keep your response conversational and supportive.
     def _identify_weak_areas(self, topic_id: str) -> List:
         """Identify weak areas in topic"""
         try:
-            from app.models import Topic
-            topic = Topic.get_by_id(topic_id, self.user_id)
+            topic = self._get_topic(topic_id)
             if topic:
 
                 topic_lower = topic.title.lower()
@@ -953,39 +1097,23 @@ Keep your response conversational and supportive.
             else:
                 return ['fundamental concepts', 'application', 'problem solving']
         except Exception as e:
-            print(f"Error identifying weak areas: {e}")
+            logger.exception("Error identifying weak areas")
             return ['fundamental concepts', 'application', 'problem solving']
     
     def _build_adaptive_quiz_prompt(self, performance, weak_areas, topic=None) -> str:
         """Build adaptive quiz prompt"""
-        # Get topic information if available
         topic_context = ""
         if topic:
-            topic_context = f"""
-Topic: {topic.title}
-Description: {topic.description}
-Subject Area: {getattr(topic, 'subject', 'General')}
-"""
-        
-        prompt = f"""
-Analyze this student's learning data and provide personalized quiz recommendations for their specific topic:
-
-{topic_context}
-Current Performance: {performance}
-Identified Weak Areas: {weak_areas}
-
-Please provide specific quiz recommendations that are directly related to the topic above. Include:
-1. Quiz type and focus area (specific to the topic)
-2. Difficulty level
-3. Estimated time required
-4. Learning objectives (topic-specific)
-5. Specific subtopics within the main topic to focus on
-
-Make sure all recommendations are directly relevant to the topic: {topic.title if topic else 'the selected topic'}.
-
-Format your response as structured recommendations that will help the student improve their understanding of this specific topic.
-"""
-        return prompt
+            topic_context = ADAPTIVE_QUIZ_TOPIC_CONTEXT.format(
+                title=topic.title,
+                description=truncate_for_prompt(topic.description),
+                subject=getattr(topic, 'subject', 'General')
+            )
+        return ADAPTIVE_QUIZ_PROMPT.format(
+            topic_context=topic_context,
+            performance=performance,
+            weak_areas=weak_areas
+        )
     
     def _call_ai_for_adaptive_quiz(self, prompt: str) -> Dict:
         """Call AI for adaptive quiz recommendations"""
@@ -1001,23 +1129,17 @@ Format your response as structured recommendations that will help the student im
             }
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert educational tutor specializing in creating personalized quiz recommendations. Analyze student performance data and provide specific, actionable quiz recommendations with difficulty levels, time estimates, and learning objectives."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=600,
-                temperature=0.7
+            ai_response = self._chat(
+                "You are an expert educational tutor specializing in creating personalized quiz recommendations. Analyze student performance data and provide specific, actionable quiz recommendations with difficulty levels, time estimates, and learning objectives.",
+                prompt,
+                max_tokens=600
             )
             
-            ai_response = response.choices[0].message.content
-            
 
             return self._parse_adaptive_quiz_response(ai_response)
             
         except Exception as e:
-            print(f"Error calling AI for adaptive quiz: {e}")
+            logger.exception("Error calling AI for adaptive quiz")
             return {
                 'recommendations': [{
                     'quiz_type': 'Error',
@@ -1032,14 +1154,11 @@ Format your response as structured recommendations that will help the student im
         """Analyze user's study patterns for learning style detection"""
         try:
             if not self.supabase:
-                return {
-                    'total_sessions': 0,
-                    'average_duration': 30,
-                    'preferred_times': ['morning'],
-                    'content_preferences': ['text'],
-                    'performance_patterns': 'stable',
-                    'study_consistency': 'low'
-                }
+                return copy.deepcopy(DEFAULT_STUDY_PATTERNS)
+            
+            cached = _study_pattern_cache.get(self.user_id)
+            if cached is not None:
+                return copy.deepcopy(cached)
             
             # Get study sessions data
             sessions_res = self.supabase.table('study_sessions').select('*').eq('user_id', self.user_id).execute()
@@ -1066,23 +1185,12 @@ Format your response as structured recommendations that will help the student im
                 'confidence_trends': self._analyze_confidence_trends(sessions)
             }
             
+            _study_pattern_cache.set(self.user_id, copy.deepcopy(study_patterns))
             return study_patterns
             
         except Exception as e:
-            print(f"Error analyzing study patterns: {e}")
-            import traceback
-            traceback.print_exc()
-            return {
-                'total_sessions': 0,
-                'average_duration': 30,
-                'preferred_times': ['morning'],
-                'content_preferences': ['text'],
-                'performance_patterns': 'stable',
-                'study_consistency': 'low',
-                'total_topics': 0,
-                'session_types': ['study'],
-                'confidence_trends': 'stable'
-            }
+            logger.exception("Error analyzing study patterns")
+            return copy.deepcopy(DEFAULT_STUDY_PATTERNS)
     
     def _analyze_study_times(self, sessions: List[Dict]) -> List[str]:
         """Analyze preferred study times"""
@@ -1102,8 +1210,6 @@ Format your response as structured recommendations that will help the student im
                 else:
                     time_preferences.append('evening')
         
-
-        from collections import Counter
         return [Counter(time_preferences).most_common(1)[0][0]] if time_preferences else ['morning']
     
     def _analyze_content_preferences(self, sessions: List[Dict]) -> List[str]:
@@ -1117,7 +1223,6 @@ Format your response as structured recommendations that will help the student im
             content_types.append(content_type)
         
         # Return most common content types
-        from collections import Counter
         return [item[0] for item in Counter(content_types).most_common(2)]
     
     def _analyze_performance_patterns(self, quiz_results: List[Dict]) -> str:
@@ -1161,8 +1266,6 @@ Format your response as structured recommendations that will help the student im
             session_type = session.get('session_type', 'study')
             session_types.append(session_type)
         
-
-        from collections import Counter
         return [item[0] for item in Counter(session_types).most_common(3)]
     
     def _analyze_confidence_trends(self, sessions: List[Dict]) -> str:
@@ -1193,80 +1296,40 @@ Format your response as structured recommendations that will help the student im
     
     def _build_learning_style_prompt(self, study_patterns: Dict) -> str:
         """Build prompt for learning style detection"""
-        prompt = f"""
-        Analyze the following study patterns to determine the user's learning style:
-        
-        Study Patterns:
-        - Total Sessions: {study_patterns.get('total_sessions', 0)}
-        - Total Topics: {study_patterns.get('total_topics', 0)}
-        - Average Duration: {study_patterns.get('average_duration', 30):.1f} minutes
-        - Preferred Study Times: {', '.join(study_patterns.get('preferred_times', ['morning']))}
-        - Content Preferences: {', '.join(study_patterns.get('content_preferences', ['text']))}
-        - Session Types: {', '.join(study_patterns.get('session_types', ['study']))}
-        - Performance Patterns: {study_patterns.get('performance_patterns', 'stable')}
-        - Confidence Trends: {study_patterns.get('confidence_trends', 'stable')}
-        - Study Consistency: {study_patterns.get('study_consistency', 'low')}
-        
-        Based on this data, determine the primary learning style and provide:
-        1. Primary learning style (visual, auditory, kinesthetic, reading_writing, or multimodal)
-        2. Confidence level (0-100%)
-        3. 3-5 personalized study recommendations
-        4. Brief explanation of why this style was chosen
-        
-        Return the response in JSON format with keys: style, confidence, recommendations, explanation.
-        """
-        return prompt
+        return LEARNING_STYLE_PROMPT.format(
+            total_sessions=study_patterns.get('total_sessions', 0),
+            total_topics=study_patterns.get('total_topics', 0),
+            average_duration=study_patterns.get('average_duration', 30),
+            preferred_times=', '.join(study_patterns.get('preferred_times', ['morning'])),
+            content_preferences=', '.join(study_patterns.get('content_preferences', ['text'])),
+            session_types=', '.join(study_patterns.get('session_types', ['study'])),
+            performance_patterns=study_patterns.get('performance_patterns', 'stable'),
+            confidence_trends=study_patterns.get('confidence_trends', 'stable'),
+            study_consistency=study_patterns.get('study_consistency', 'low')
+        )
     
     def _call_ai_for_learning_style(self, prompt: str) -> Dict:
         """Call OpenAI API for learning style analysis"""
         if not self.client:
-            return {
-                'style': 'visual',
-                'confidence': 75,
-                'recommendations': [
-                    'Use visual aids like diagrams and charts',
-                    'Create mind maps for complex topics',
-                    'Watch educational videos',
-                    'Use color coding in your notes',
-                    'Practice with visual flashcards'
-                ],
-                'explanation': 'Based on your study patterns, you appear to be a visual learner who benefits from visual representations of information.'
-            }
+            return copy.deepcopy(DEFAULT_LEARNING_STYLE)
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert in learning psychology and cognitive science. Analyze study patterns to determine learning styles and provide personalized recommendations."},
-                    {"role": "user", "content": prompt}
-                ],
+            ai_response = self._chat(
+                "You are an expert in learning psychology and cognitive science. Analyze study patterns to determine learning styles and provide personalized recommendations. Respond with a JSON object.",
+                prompt,
                 max_tokens=500,
-                temperature=0.7
+                json_mode=True
             )
             
-            ai_response = response.choices[0].message.content
-            
-            # Try to parse JSON response
-            try:
-                import json
-                return json.loads(ai_response)
-            except:
-                # Fallback parsing if JSON is not returned
-                return self._parse_learning_style_response(ai_response)
+            learning_style = parse_json_object(ai_response)
+            if learning_style is not None:
+                return learning_style
+            # Fallback parsing if JSON is not returned
+            return self._parse_learning_style_response(ai_response)
                 
         except Exception as e:
-            print(f"Error calling AI for learning style: {e}")
-            return {
-                'style': 'visual',
-                'confidence': 70,
-                'recommendations': [
-                    'Use visual learning materials',
-                    'Create diagrams and charts',
-                    'Watch educational videos',
-                    'Use color coding in notes'
-                ],
-                'explanation': 'Based on your study patterns, you appear to be a visual learner.'
-            }
+            logger.exception("Error calling AI for learning style")
+            return copy.deepcopy(DEFAULT_LEARNING_STYLE)
     
     def _parse_learning_style_response(self, response: str) -> Dict:
         """Parse AI response for learning style"""
@@ -1281,9 +1344,7 @@ Format your response as structured recommendations that will help the student im
         elif 'multimodal' in response.lower():
             style = 'multimodal'
         
-
-        import re
-        confidence_match = re.search(r'(\d+)%', response)
+        confidence_match = _CONFIDENCE_RE.search(response)
         confidence = int(confidence_match.group(1)) if confidence_match else 75
         
 
@@ -1301,7 +1362,7 @@ Format your response as structured recommendations that will help the student im
             'explanation': 'Based on your study patterns, you appear to be a ' + style + ' learner.'
         }
     
-    def _save_learning_style(self, learning_style: Dict):
+    def _save_learning_style(self, learning_style: Dict, created_at: str = None):
         """Save learning style to database"""
         try:
             if not self.supabase:
@@ -1314,11 +1375,11 @@ Format your response as structured recommendations that will help the student im
                 'confidence_score': learning_style.get('confidence', 75),
                 'recommendations': learning_style.get('recommendations', []),
                 'study_patterns': learning_style.get('study_patterns', {}),
-                'created_at': datetime.now().isoformat()
+                'created_at': created_at or datetime.now().isoformat()
             }
             
             # Use upsert to update existing record or create new one
             self.supabase.table('ai_learning_styles').upsert(style_data).execute()
             
         except Exception as e:
-            print(f"Error saving learning style: {e}")
+            logger.exception("Error saving learning style")
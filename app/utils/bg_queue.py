@@ -0,0 +1,106 @@
+"""
+Background Write Queue
+Fire-and-forget Supabase inserts and upserts for rows the caller does not need to wait on
+"""
+
+import os
+import time
+import queue
+import atexit
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple, Union
+
+from app.models import get_supabase_client
+
+logger = logging.getLogger(__name__)
+
+BG_QUEUE_MAX_SIZE = int(os.getenv('BG_QUEUE_MAX_SIZE', '10000'))
+BG_QUEUE_BATCH_SIZE = int(os.getenv('BG_QUEUE_BATCH_SIZE', '50'))
+BG_QUEUE_FLUSH_SECONDS = float(os.getenv('BG_QUEUE_FLUSH_SECONDS', '1.0'))
+
+_queue = queue.Queue(maxsize=BG_QUEUE_MAX_SIZE)
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def _insert(table: str, rows: Union[dict, List[dict]], on_conflict: Optional[str] = None):
+    client = get_supabase_client()
+    if not client:
+        return
+    try:
+        query = client.table(table)
+        if on_conflict:
+            query.upsert(rows, on_conflict=on_conflict).execute()
+        else:
+            query.insert(rows).execute()
+    except Exception:
+        if isinstance(rows, list) and len(rows) > 1:
+            # One bad row fails the whole array insert; retry individually so the rest still land
+            for row in rows:
+                _insert(table, row, on_conflict)
+        else:
+            logger.exception("Error writing queued row to %s", table)
+
+
+def _write_batch(batch: List[Tuple[str, dict, Optional[str]]]):
+    """Write a drained batch with one array insert or upsert per table"""
+    rows_by_target: Dict[Tuple[str, Optional[str]], List[dict]] = {}
+    for table, row, on_conflict in batch:
+        rows_by_target.setdefault((table, on_conflict), []).append(row)
+    for (table, on_conflict), rows in rows_by_target.items():
+        if on_conflict:
+            # Postgres rejects an upsert that touches the same row twice, so only the latest row per key is sent
+            columns = on_conflict.split(',')
+            rows = list({tuple(row.get(column) for column in columns): row for row in rows}.values())
+        _insert(table, rows, on_conflict)
+
+
+def _run():
+    while True:
+        batch = [_queue.get()]
+        deadline = time.monotonic() + BG_QUEUE_FLUSH_SECONDS
+        while len(batch) < BG_QUEUE_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        try:
+            _write_batch(batch)
+        except Exception:
+            # Keep the worker alive; a dead worker would leave flush() waiting forever
+            logger.exception("Error writing queued batch")
+        finally:
+            for _ in batch:
+                _queue.task_done()
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name='bg-queue-writer', daemon=True)
+            _worker.start()
+
+
+def put(table: str, row: dict, on_conflict: Optional[str] = None):
+    """Queue a row for insertion, or an upsert on the on_conflict columns; written synchronously when the queue is full"""
+    _ensure_worker()
+    try:
+        _queue.put_nowait((table, row, on_conflict))
+    except queue.Full:
+        _insert(table, row, on_conflict)
+
+
+def flush():
+    """Block until every queued row has been written"""
+    _queue.join()
+
+
+# The worker is a daemon thread, so rows still queued at shutdown would otherwise be dropped
+atexit.register(flush)
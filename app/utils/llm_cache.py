@@ -0,0 +1,222 @@
+"""
+LLM Response Cache
+Exact-match cache for chat completion results, keyed on the full request
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_TTL_SECONDS = int(os.getenv('LLM_CACHE_TTL_SECONDS', str(6 * 60 * 60)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '2048'))
+# Optional SQLite file shared by every worker process on the host; unset keeps the cache in-process only
+LLM_CACHE_SQLITE_PATH = os.getenv('LLM_CACHE_SQLITE_PATH')
+
+
+def make_cache_key(model: str, system: str, user: str, max_tokens: int,
+                   temperature: float = None, json_mode: bool = False) -> str:
+    """Hash everything that determines a completion into a stable cache key"""
+    payload = json.dumps({
+        'model': model,
+        'system': system,
+        'user': user,
+        'max_tokens': max_tokens,
+        'temperature': temperature,
+        'json_mode': json_mode
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SQLiteCacheStore:
+    """Expiring key/value table in a WAL-mode SQLite file, readable by every worker process"""
+
+    # Expired rows are swept on every Nth write rather than on each one
+    PURGE_EVERY = 256
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        # Request threads share one store, so the write counter needs its own guard
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread, opened lazily so forked workers never share a handle
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS llm_cache '
+                '(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """Return (value, seconds left) for an unexpired key, or None"""
+        now = time.time()
+        try:
+            row = self._connection().execute(
+                'SELECT value, expires_at FROM llm_cache WHERE key = ? AND expires_at > ?', (key, now)
+            ).fetchone()
+        except sqlite3.Error:
+            logger.exception("Error reading LLM cache store")
+            return None
+        return (row[0], row[1] - now) if row else None
+
+    def set(self, key: str, value: str, ttl: int):
+        """Store value under key for ttl seconds"""
+        now = time.time()
+        try:
+            conn = self._connection()
+            conn.execute(
+                'INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, value, now + ttl)
+            )
+            with self._lock:
+                self._writes += 1
+                purge = self._writes % self.PURGE_EVERY == 0
+            if purge:
+                conn.execute('DELETE FROM llm_cache WHERE expires_at <= ?', (now,))
+        except sqlite3.Error:
+            logger.exception("Error writing LLM cache store")
+
+    def clear(self):
+        """Drop every stored entry"""
+        try:
+            self._connection().execute('DELETE FROM llm_cache')
+        except sqlite3.Error:
+            logger.exception("Error clearing LLM cache store")
+
+
+class TTLCache:
+    """Thread-safe in-process TTL cache with least-recently-used eviction"""
+
+    def __init__(self, ttl: int, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, key: str, value: Any, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _lookup(self, key: str) -> Optional[Any]:
+        # Caller holds the lock; an expired entry is dropped on the way
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] >= time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        if entry is not None:
+            del self._entries[key]
+        return None
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if it is missing or expired"""
+        with self._lock:
+            value = self._lookup(key)
+            if value is None:
+                self.misses += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: int = None):
+        """Store value under key for ttl seconds"""
+        self._remember(key, value, ttl if ttl is not None else self.ttl)
+
+    def clear(self):
+        """Drop every cached entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class LLMCache(TTLCache):
+    """TTLCache of completion text, optionally backed by a store shared across worker processes"""
+
+    def __init__(self, ttl: int = LLM_CACHE_TTL_SECONDS, max_entries: int = LLM_CACHE_MAX_ENTRIES,
+                 store: Optional[SQLiteCacheStore] = None):
+        super().__init__(ttl, max_entries)
+        self.store = store
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for key, or None if it is missing or expired"""
+        with self._lock:
+            value = self._lookup(key)
+        if value is not None:
+            return value
+        stored = self.store.get(key) if self.store else None
+        if stored is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        value, ttl_left = stored
+        self._remember(key, value, ttl_left)
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: str, ttl: int = None):
+        """Store value under key for ttl seconds"""
+        ttl = ttl if ttl is not None else self.ttl
+        self._remember(key, value, ttl)
+        if self.store:
+            self.store.set(key, value, ttl)
+
+    def clear(self):
+        """Drop every cached entry and reset the counters"""
+        super().clear()
+        if self.store:
+            self.store.clear()
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one; later callers wait for the first"""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], str]) -> str:
+        """Run fn for key unless a call for key is already in flight, then share its result"""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+llm_cache = LLMCache(store=SQLiteCacheStore(LLM_CACHE_SQLITE_PATH) if LLM_CACHE_SQLITE_PATH else None)
+llm_inflight = SingleFlight()
@@ -0,0 +1,54 @@
+"""
+OpenAI Client
+Process-wide OpenAI client, imported and built on first use
+"""
+
+import os
+import logging
+import threading
+
+from app.utils.openai_limiter import OPENAI_MAX_CONCURRENT
+
+logger = logging.getLogger(__name__)
+
+OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
+# The SDK default of 600s would pin a sync worker for ten minutes on a stalled request
+OPENAI_TIMEOUT_SECONDS = float(os.getenv('OPENAI_TIMEOUT_SECONDS', '60'))
+OPENAI_CONNECT_TIMEOUT_SECONDS = float(os.getenv('OPENAI_CONNECT_TIMEOUT_SECONDS', '10'))
+
+_CLIENT_SINGLETON = None
+_CLIENT_API_KEY = None
+_client_lock = threading.Lock()
+
+
+def get_openai_client():
+    """Return a shared OpenAI client, or None when the package or API key is missing"""
+    global _CLIENT_SINGLETON, _CLIENT_API_KEY
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        return None
+    if _CLIENT_SINGLETON is not None and _CLIENT_API_KEY == api_key:
+        return _CLIENT_SINGLETON
+    with _client_lock:
+        if _CLIENT_SINGLETON is None or _CLIENT_API_KEY != api_key:
+            # Deferred so workers that never call the AI features skip the openai/httpx/pydantic import
+            try:
+                import httpx
+                import openai
+            except ImportError:
+                return None
+            try:
+                # One HTTP/2 pool for every caller; sized to the limiter's concurrency cap
+                http_client = httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=OPENAI_MAX_CONCURRENT,
+                                        max_keepalive_connections=OPENAI_MAX_CONCURRENT)
+                )
+                # Fail fast on an unreachable endpoint, but allow long generations once connected
+                timeout = httpx.Timeout(OPENAI_TIMEOUT_SECONDS, connect=OPENAI_CONNECT_TIMEOUT_SECONDS)
+                _CLIENT_SINGLETON = openai.OpenAI(api_key=api_key, http_client=http_client, timeout=timeout)
+                _CLIENT_API_KEY = api_key
+            except Exception:
+                logger.exception("Error initializing OpenAI client")
+                return None
+        return _CLIENT_SINGLETON
@@ -0,0 +1,72 @@
+"""
+OpenAI Rate Limiter
+Process-wide request and token buckets that throttle calls before the API returns 429s
+"""
+
+import os
+import time
+import threading
+from contextlib import contextmanager
+
+OPENAI_MAX_REQUESTS_PER_MINUTE = float(os.getenv('OPENAI_MAX_REQUESTS_PER_MINUTE', '3000'))
+OPENAI_MAX_TOKENS_PER_MINUTE = float(os.getenv('OPENAI_MAX_TOKENS_PER_MINUTE', '90000'))
+OPENAI_MAX_CONCURRENT = int(os.getenv('OPENAI_MAX_CONCURRENT', '20'))
+
+
+def estimate_tokens(prompt: str, max_tokens: int) -> int:
+    """Rough token cost of a request: ~4 characters per prompt token plus the completion budget"""
+    return len(prompt) // 4 + max_tokens
+
+
+class OpenAIRateLimiter:
+    """Leaky-bucket limiter over requests/minute and tokens/minute with a concurrency cap"""
+
+    def __init__(self, max_requests_per_minute: float = OPENAI_MAX_REQUESTS_PER_MINUTE,
+                 max_tokens_per_minute: float = OPENAI_MAX_TOKENS_PER_MINUTE,
+                 max_concurrent: int = OPENAI_MAX_CONCURRENT):
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self.available_request_capacity = max_requests_per_minute
+        self.available_token_capacity = max_tokens_per_minute
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed_minutes = (now - self._last_refill) / 60.0
+        self._last_refill = now
+        self.available_request_capacity = min(
+            self.max_requests_per_minute,
+            self.available_request_capacity + elapsed_minutes * self.max_requests_per_minute
+        )
+        self.available_token_capacity = min(
+            self.max_tokens_per_minute,
+            self.available_token_capacity + elapsed_minutes * self.max_tokens_per_minute
+        )
+
+    def acquire(self, tokens: int):
+        """Block until one request and the given number of tokens are available"""
+        # A single request larger than the whole bucket could never be admitted
+        tokens = min(tokens, self.max_tokens_per_minute)
+        while True:
+            with self._lock:
+                self._refill()
+                if self.available_request_capacity >= 1 and self.available_token_capacity >= tokens:
+                    self.available_request_capacity -= 1
+                    self.available_token_capacity -= tokens
+                    return
+                request_wait = (1 - self.available_request_capacity) / self.max_requests_per_minute * 60.0
+                token_wait = (tokens - self.available_token_capacity) / self.max_tokens_per_minute * 60.0
+                delay = max(request_wait, token_wait, 0.01)
+            time.sleep(delay)
+
+    @contextmanager
+    def reserve(self, tokens: int):
+        """Hold a concurrency slot and rate-limit budget for the duration of one API call"""
+        with self._slots:
+            self.acquire(tokens)
+            yield
+
+
+openai_limiter = OpenAIRateLimiter()
@@ -0,0 +1,57 @@
+"""
+Prompt Text Helpers
+Normalise text going into LLM prompts and pull structured data back out of replies
+"""
+
+import re
+import json
+from typing import Optional
+
+# Roughly 500 tokens at ~4 characters per token
+PROMPT_DESCRIPTION_MAX_CHARS = 2000
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def truncate_for_prompt(text: Optional[str], max_chars: int = PROMPT_DESCRIPTION_MAX_CHARS) -> str:
+    """Collapse whitespace and cap user-supplied text before it is interpolated into a prompt"""
+    if not text:
+        return ''
+    text = _WHITESPACE_RE.sub(' ', text).strip()
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    # Prefer ending on a full sentence, then on a whole word, as long as at least half the text survives
+    sentence_end = cut.rfind('. ')
+    if sentence_end > max_chars // 2:
+        cut = cut[:sentence_end + 1]
+    else:
+        boundary = cut.rfind(' ')
+        if boundary > max_chars // 2:
+            cut = cut[:boundary]
+    return cut.rstrip() + '…'
+
+
+def parse_json_object(content: Optional[str]) -> Optional[dict]:
+    """Parse a JSON object from an LLM reply, tolerating surrounding prose; None if there is none"""
+    if not content:
+        return None
+    try:
+        data = json.loads(content)
+        return data if isinstance(data, dict) else None
+    except ValueError:
+        pass
+    # Decode from each opening brace in turn; raw_decode stops at the end of the object,
+    # so code fences or notes after it (even ones containing braces) are ignored
+    start = content.find('{')
+    while start != -1:
+        try:
+            data, _ = _JSON_DECODER.raw_decode(content, start)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            return data
+        start = content.find('{', start + 1)
+    return None
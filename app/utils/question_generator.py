@@ -1,19 +1,68 @@
 
 import re
 import random
-import json
-import os
+import logging
 from typing import List, Dict, Optional
 from datetime import datetime
-from dotenv import load_dotenv
+from app.utils.openai_client import OPENAI_MODEL, get_openai_client
+from app.utils.openai_limiter import openai_limiter, estimate_tokens
+from app.utils.prompt_text import parse_json_object, truncate_for_prompt
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+# Completion budget for an AI quiz: the JSON envelope plus one question with four
+# options and an explanation per requested question (~200-230 tokens, with headroom).
+# Never below the old fixed 2000, since a reply cut off at the limit is unparseable
+QUIZ_BASE_TOKENS = 200
+QUIZ_TOKENS_PER_QUESTION = 350
+QUIZ_MIN_TOKENS = 2000
+
+# The response schema and formatting rules never change, so they live in the system
+# message; only the short per-quiz request below varies between calls
+QUIZ_SYSTEM_PROMPT = """You are an expert educational content creator specializing in quiz generation. Create high-quality, educational quiz questions based on the given topic.
+
+Requirements:
+- Questions should test understanding, not just memorization
+- Include clear explanations for each answer
+- Make questions relevant and educational
+- Ensure variety in question types
+
+Return your response as a JSON object with this exact structure:
+{
+    "quiz_title": "Quiz about <topic>",
+    "quiz_description": "Test your knowledge of <topic>",
+    "difficulty": "<requested difficulty>",
+    "questions": [
+        {
+            "question_text": "Question text here",
+            "question_type": "multiple_choice",
+            "options": [
+                {"text": "Option 1", "is_correct": false},
+                {"text": "Option 2", "is_correct": true},
+                {"text": "Option 3", "is_correct": false},
+                {"text": "Option 4", "is_correct": false}
+            ],
+            "correct_answer": "Option 2",
+            "explanation": "Explanation of why this answer is correct",
+            "difficulty": "medium",
+            "points": 2
+        }
+    ]
+}
+
+For multiple choice: include 4 options with exactly one correct answer.
+For true/false: set question_type to "true_false" and correct_answer to "True" or "False".
+For fill-in-blank: set question_type to "fill_blank" and provide the correct answer text."""
+
+QUIZ_GENERATION_PROMPT = """Generate a quiz with {num_questions} questions based on this topic:
+
+Topic: {title}
+Description: {description}
+
+Quiz settings:
+- Use these question types: {question_types}
+- Difficulty level: {difficulty}
+"""
 
 
 class SmartQuestionGenerator:
@@ -353,18 +402,7 @@ class SmartQuestionGenerator:
     @staticmethod
     def get_openai_client():
         """Get OpenAI client if available"""
-        if not OPENAI_AVAILABLE:
-            return None
-            
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
-            return None
-            
-        try:
-            return openai.OpenAI(api_key=api_key)
-        except Exception as e:
-            print(f"Error initializing OpenAI client: {e}")
-            return None
+        return get_openai_client()
     
     @staticmethod
     def generate_smart_quiz_from_topic(topic_title: str, topic_description: str, 
@@ -404,31 +442,32 @@ class SmartQuestionGenerator:
                 topic_title, topic_description, num_questions, difficulty, question_types
             )
             
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert educational content creator specializing in quiz generation. Create high-quality, educational quiz questions based on the given topic."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=2000,
-                temperature=0.7
-            )
+            max_tokens = max(QUIZ_MIN_TOKENS, QUIZ_BASE_TOKENS + QUIZ_TOKENS_PER_QUESTION * num_questions)
+            with openai_limiter.reserve(tokens=estimate_tokens(QUIZ_SYSTEM_PROMPT + prompt, max_tokens)):
+                response = client.chat.completions.create(
+                    model=OPENAI_MODEL,
+                    messages=[
+                        {"role": "system", "content": QUIZ_SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=max_tokens,
+                    temperature=0.7,
+                    response_format={"type": "json_object"}
+                )
             
-            quiz_content = response.choices[0].message.content
+            choice = response.choices[0]
+            if choice.finish_reason == 'length':
+                # Truncated JSON cannot be parsed; say so rather than quietly using the fallback quiz
+                logger.warning("AI quiz reply hit the %d token limit for %d questions; using fallback quiz",
+                               max_tokens, num_questions)
+                return None
             
-
-            try:
-                quiz_data = json.loads(quiz_content)
+            quiz_data = parse_json_object(choice.message.content)
+            if quiz_data is not None:
                 return SmartQuestionGenerator._validate_and_format_ai_quiz(quiz_data, topic_title)
-            except json.JSONDecodeError:
-
-                json_match = re.search(r'\{.*\}', quiz_content, re.DOTALL)
-                if json_match:
-                    quiz_data = json.loads(json_match.group())
-                    return SmartQuestionGenerator._validate_and_format_ai_quiz(quiz_data, topic_title)
                 
         except Exception as e:
-            print(f"AI quiz generation failed: {e}")
+            logger.exception("AI quiz generation failed")
         
         return None
     
@@ -436,53 +475,13 @@ class SmartQuestionGenerator:
     def _create_quiz_generation_prompt(topic_title: str, topic_description: str, 
                                      num_questions: int, difficulty: str, question_types: List[str]) -> str:
         """Create a detailed prompt for AI quiz generation"""
-        
-        question_types_str = ", ".join(question_types)
-        
-        prompt = f"""
-Generate a quiz with {num_questions} questions based on this topic:
-
-Topic: {topic_title}
-Description: {topic_description}
-
-Requirements:
-- Create {num_questions} questions
-- Use these question types: {question_types_str}
-- Difficulty level: {difficulty}
-- Questions should test understanding, not just memorization
-- Include clear explanations for each answer
-- Make questions relevant and educational
-- Ensure variety in question types
-
-Return your response as a JSON object with this exact structure:
-{{
-    "quiz_title": "Quiz about {topic_title}",
-    "quiz_description": "Test your knowledge of {topic_title}",
-    "difficulty": "{difficulty}",
-    "questions": [
-        {{
-            "question_text": "Question text here",
-            "question_type": "multiple_choice",
-            "options": [
-                {{"text": "Option 1", "is_correct": false}},
-                {{"text": "Option 2", "is_correct": true}},
-                {{"text": "Option 3", "is_correct": false}},
-                {{"text": "Option 4", "is_correct": false}}
-            ],
-            "correct_answer": "Option 2",
-            "explanation": "Explanation of why this answer is correct",
-            "difficulty": "medium",
-            "points": 2
-        }}
-    ]
-}}
-
-For multiple choice: include 4 options with exactly one correct answer.
-For true/false: set question_type to "true_false" and correct_answer to "True" or "False".
-For fill-in-blank: set question_type to "fill_blank" and provide the correct answer text.
-"""
-        
-        return prompt
+        return QUIZ_GENERATION_PROMPT.format(
+            num_questions=num_questions,
+            title=topic_title,
+            description=truncate_for_prompt(topic_description),
+            question_types=", ".join(question_types),
+            difficulty=difficulty
+        )
     
     @staticmethod
     def _validate_and_format_ai_quiz(quiz_data: Dict, topic_title: str) -> Optional[Dict]:
@@ -515,7 +514,7 @@ For fill-in-blank: set question_type to "fill_blank" and provide the correct ans
             }
             
         except Exception as e:
-            print(f"Error validating AI quiz: {e}")
+            logger.exception("Error validating AI quiz")
             return None
     
     @staticmethod
@@ -576,7 +575,7 @@ For fill-in-blank: set question_type to "fill_blank" and provide the correct ans
             return formatted_question
             
         except Exception as e:
-            print(f"Error formatting AI question: {e}")
+            logger.exception("Error formatting AI question")
             return None
     
     @staticmethod
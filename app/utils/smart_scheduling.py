@@ -1,7 +1,12 @@
 
 
+import copy
 import json
+import heapq
+from operator import itemgetter
+from statistics import median_high
 from datetime import datetime, time, timedelta
+from functools import lru_cache
 from typing import List, Dict, Optional, Any, Tuple
 from app.models.reminders import (
     StudyReminderPreferences, StudyReminder, StudySchedule, 
@@ -9,6 +14,36 @@ from app.models.reminders import (
 )
 from app.models.study_session import StudySession
 from app.models import Topic
+from app.utils import bg_queue
+from app.utils.llm_cache import TTLCache
+
+
+# Patterns come from the last 100 sessions; one request often asks for them several times
+PATTERN_CACHE_TTL_SECONDS = 60
+PATTERN_CACHE_MAX_USERS = 1024
+
+_pattern_cache = TTLCache(ttl=PATTERN_CACHE_TTL_SECONDS, max_entries=PATTERN_CACHE_MAX_USERS)
+
+# The only session fields the analyzers read; notes and the rest stay in the database
+PATTERN_SESSION_COLUMNS = ('created_at', 'duration_minutes', 'topic_id', 'confidence_before', 'confidence_after')
+# Below this many sessions the patterns are mostly defaults and not worth storing
+MIN_SESSIONS_TO_STORE_PATTERNS = 10
+PATTERN_UPSERT_CONFLICT = 'user_id,pattern_type'
+
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+DEFAULT_PEAK_HOURS = (9, 14, 20)
+DEFAULT_BEST_DAYS = ('Monday', 'Wednesday', 'Friday')
+
+
+def _sample_confidence(sample_size: int, full_confidence_at: int) -> float:
+    # Confidence grows with the number of samples behind a pattern, capped at 0.9
+    return min(0.9, sample_size / full_confidence_at)
+
+
+# Session timestamps repeat across refreshes, so each distinct string is parsed once per process
+@lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
 
 
 class SmartSchedulingEngine:
@@ -20,49 +55,62 @@ class SmartSchedulingEngine:
     def analyze_study_patterns(self, user_id: str) -> Dict[str, Any]:
         
         try:
+            # Callers get their own copy, so nothing they change leaks into the cached patterns
+            cached = _pattern_cache.get(user_id)
+            if cached is not None:
+                return copy.deepcopy(cached)
             
-            sessions = StudySession.get_user_sessions(user_id, limit=100)
+            sessions = StudySession.get_user_session_rows(user_id, PATTERN_SESSION_COLUMNS, limit=100)
             
             if not sessions:
                 return self._get_default_patterns()
             
             
+            columns = self._extract_session_columns(sessions)
             patterns = {
-                'peak_hours': self._analyze_peak_hours(sessions),
-                'best_days': self._analyze_best_days(sessions),
-                'session_duration': self._analyze_session_duration(sessions),
-                'topic_preferences': self._analyze_topic_preferences(sessions),
-                'confidence_trends': self._analyze_confidence_trends(sessions),
-                'study_consistency': self._analyze_study_consistency(sessions)
+                'peak_hours': self._analyze_peak_hours(columns),
+                'best_days': self._analyze_best_days(columns),
+                'session_duration': self._analyze_session_duration(columns),
+                'topic_preferences': self._analyze_topic_preferences(columns),
+                'confidence_trends': self._analyze_confidence_trends(columns),
+                'study_consistency': self._analyze_study_consistency(columns)
             }
             
             
-            for pattern_type, pattern_data in patterns.items():
-                StudyPattern.update_pattern(
-                    user_id=user_id,
-                    pattern_type=pattern_type,
-                    pattern_data=pattern_data,
-                    confidence_score=pattern_data.get('confidence', 0.5),
-                    sample_size=len(sessions)
-                )
+            # Nothing here reads the stored rows back, so the upsert goes through the background writer.
+            # The rows get their own copy of the patterns, since the caller may change them before it runs
+            if len(sessions) >= MIN_SESSIONS_TO_STORE_PATTERNS:
+                for row in StudyPattern.pattern_rows(user_id, copy.deepcopy(patterns), len(sessions)):
+                    bg_queue.put('study_patterns', row, on_conflict=PATTERN_UPSERT_CONFLICT)
             
+            _pattern_cache.set(user_id, copy.deepcopy(patterns))
             return patterns
             
         except Exception as e:
             print(f"Error analyzing study patterns: {e}")
             return self._get_default_patterns()
     
-    def suggest_optimal_study_times(self, user_id: str, days_ahead: int = 7) -> List[OptimalStudyTime]:
+    def suggest_optimal_study_times(self, user_id: str, days_ahead: int = 7,
+                                    patterns: Dict[str, Any] = None,
+                                    now: datetime = None,
+                                    topics: List = None, limit: int = 10) -> List[OptimalStudyTime]:
         
         try:
             
-            patterns = self.analyze_study_patterns(user_id)
+            if patterns is None:
+                patterns = self.analyze_study_patterns(user_id)
             
             
             preferences = StudyReminderPreferences.get_or_create_preferences(user_id)
             
+            # Every day offers the same topics, so fetch them once for the whole window
+            if topics is None:
+                topics = Topic.get_all_by_user(user_id, limit=3)
+            
+            # Read the clock once so every day in the window is judged against the same instant
+            now = now or datetime.now()
             suggestions = []
-            current_date = datetime.now().date()
+            current_date = now.date()
             
             for day_offset in range(days_ahead):
                 target_date = current_date + timedelta(days=day_offset)
@@ -73,14 +121,14 @@ class SmartSchedulingEngine:
                 
                 
                 day_suggestions = self._get_optimal_times_for_day(
-                    user_id, target_date, patterns, preferences
+                    user_id, target_date, patterns, preferences, now, topics
                 )
                 suggestions.extend(day_suggestions)
             
+            # Rank before inserting so only the suggestions the caller will see are stored
+            best = heapq.nlargest(limit, suggestions, key=itemgetter('confidence_score'))
             
-            suggestions.sort(key=lambda x: x.confidence_score, reverse=True)
-            
-            return suggestions[:10]  
+            return OptimalStudyTime.create_suggestions_bulk(best)
             
         except Exception as e:
             print(f"Error suggesting optimal study times: {e}")
@@ -96,16 +144,17 @@ class SmartSchedulingEngine:
                 return []
             
             
-            optimal_times = self.suggest_optimal_study_times(user_id, days_ahead=7)
+            now = datetime.now()
+            optimal_times = self.suggest_optimal_study_times(user_id, days_ahead=7, now=now, limit=5)
             
             reminders = []
             
-            for optimal_time in optimal_times[:5]:  
+            for optimal_time in optimal_times:  
                 
                 reminder_time = optimal_time.suggested_time - timedelta(minutes=preferences.advance_notice_minutes)
                 
                 
-                if reminder_time <= datetime.now():
+                if reminder_time <= now:
                     continue
                 
                 
@@ -135,11 +184,12 @@ class SmartSchedulingEngine:
         
         try:
             
-            optimal_times = self.suggest_optimal_study_times(user_id, days_ahead=3)
+            now = datetime.now()
+            optimal_times = self.suggest_optimal_study_times(user_id, days_ahead=3, now=now, limit=1)
             
             if not optimal_times:
                 
-                start_time = datetime.now() + timedelta(hours=1)
+                start_time = now + timedelta(hours=1)
                 end_time = start_time + timedelta(minutes=duration_minutes)
             else:
                 
@@ -150,9 +200,13 @@ class SmartSchedulingEngine:
             
             topic_title = "General Study"
             if topic_id:
-                topic = Topic.get_by_id(topic_id)
-                if topic:
-                    topic_title = topic.title
+                # The title only decorates the schedule, so a failed lookup keeps the generic one
+                try:
+                    topic = Topic.get_by_id(topic_id, user_id)
+                    if topic:
+                        topic_title = topic.title
+                except Exception as e:
+                    print(f"Error loading topic for schedule: {e}")
             
             
             schedule = StudySchedule.create_schedule(
@@ -172,33 +226,53 @@ class SmartSchedulingEngine:
             print(f"Error scheduling study session: {e}")
             return None
     
-    def _analyze_peak_hours(self, sessions: List) -> Dict[str, Any]:
+    def _extract_session_columns(self, sessions: List[Dict[str, Any]]) -> Dict[str, List]:
+        
+        # One pass over the sessions so each analyzer reads parsed columns instead of re-walking them
+        columns = {
+            'times': [],
+            'durations': [],
+            'topic_ids': [],
+            'confidence_before': [],
+            'confidence_after': []
+        }
+        
+        for session in sessions:
+            columns['times'].append(self._parse_session_time(session.get('created_at')))
+            columns['durations'].append(session.get('duration_minutes'))
+            columns['topic_ids'].append(session.get('topic_id'))
+            columns['confidence_before'].append(session.get('confidence_before'))
+            columns['confidence_after'].append(session.get('confidence_after'))
         
-        if not sessions:
-            return {'peak_hours': [9, 14, 20], 'confidence': 0.3}
+        return columns
+    
+    @staticmethod
+    def _parse_session_time(value) -> Optional[datetime]:
+        
+        if not value:
+            return None
+        if not isinstance(value, str):
+            return value
+        try:
+            return _parse_iso(value)
+        except ValueError:
+            return None
+    
+    def _analyze_peak_hours(self, columns: Dict[str, List]) -> Dict[str, Any]:
         
         hour_counts = {}
-        total_sessions = len(sessions)
+        total_sessions = len(columns['times'])
         
-        for session in sessions:
-            if hasattr(session, 'created_at') and session.created_at:
-                try:
-                    if isinstance(session.created_at, str):
-                        session_time = datetime.fromisoformat(session.created_at.replace('Z', '+00:00'))
-                    else:
-                        session_time = session.created_at
-                    
-                    hour = session_time.hour
-                    hour_counts[hour] = hour_counts.get(hour, 0) + 1
-                except:
-                    continue
+        for session_time in columns['times']:
+            if session_time:
+                hour = session_time.hour
+                hour_counts[hour] = hour_counts.get(hour, 0) + 1
         
         if not hour_counts:
-            return {'peak_hours': [9, 14, 20], 'confidence': 0.3}
+            return {'peak_hours': list(DEFAULT_PEAK_HOURS), 'confidence': 0.3}
         
         
-        sorted_hours = sorted(hour_counts.items(), key=lambda x: x[1], reverse=True)
-        peak_hours = [hour for hour, count in sorted_hours[:3]]
+        peak_hours = [hour for hour, count in heapq.nlargest(3, hour_counts.items(), key=itemgetter(1))]
         
         
         max_count = max(hour_counts.values())
@@ -210,93 +284,87 @@ class SmartSchedulingEngine:
             'confidence': confidence
         }
     
-    def _analyze_best_days(self, sessions: List) -> Dict[str, Any]:
+    def _analyze_best_days(self, columns: Dict[str, List]) -> Dict[str, Any]:
         
-        if not sessions:
-            return {'best_days': ['Monday', 'Wednesday', 'Friday'], 'confidence': 0.3}
+        if not columns['times']:
+            return {'best_days': list(DEFAULT_BEST_DAYS), 'confidence': 0.3}
         
-        day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        day_counts = {day: 0 for day in day_names}
-        day_confidence = {day: [] for day in day_names}
+        day_counts = [0] * 7
+        confidence_sums = [0] * 7
+        confidence_counts = [0] * 7
         
-        for session in sessions:
-            if hasattr(session, 'created_at') and session.created_at:
-                try:
-                    if isinstance(session.created_at, str):
-                        session_time = datetime.fromisoformat(session.created_at.replace('Z', '+00:00'))
-                    else:
-                        session_time = session.created_at
-                    
-                    day_name = day_names[session_time.weekday()]
-                    day_counts[day_name] += 1
-                    
-                    
-                    if hasattr(session, 'confidence_after') and session.confidence_after:
-                        day_confidence[day_name].append(session.confidence_after)
-                except:
-                    continue
+        for session_time, confidence_after in zip(columns['times'], columns['confidence_after']):
+            if session_time:
+                weekday = session_time.weekday()
+                day_counts[weekday] += 1
+                
+                
+                if confidence_after:
+                    confidence_sums[weekday] += confidence_after
+                    confidence_counts[weekday] += 1
         
         
-        day_scores = {}
-        for day in day_names:
-            count = day_counts[day]
-            avg_confidence = sum(day_confidence[day]) / len(day_confidence[day]) if day_confidence[day] else 0
-            day_scores[day] = count * (1 + avg_confidence / 10)  
+        day_confidence = [
+            confidence_sums[weekday] / confidence_counts[weekday] if confidence_counts[weekday] else 0
+            for weekday in range(7)
+        ]
+        day_scores = [day_counts[weekday] * (1 + day_confidence[weekday] / 10) for weekday in range(7)]
         
-        sorted_days = sorted(day_scores.items(), key=lambda x: x[1], reverse=True)
-        best_days = [day for day, score in sorted_days[:3] if score > 0]
+        best_days = [DAY_NAMES[weekday] for weekday in heapq.nlargest(3, range(7), key=day_scores.__getitem__)
+                     if day_scores[weekday] > 0]
         
         if not best_days:
-            best_days = ['Monday', 'Wednesday', 'Friday']
+            best_days = list(DEFAULT_BEST_DAYS)
         
-        confidence = min(0.9, len([s for s in sessions if s]) / 10)
+        confidence = _sample_confidence(len(columns['times']), 10)
         
         return {
             'best_days': best_days,
-            'day_distribution': day_counts,
-            'day_confidence': {day: sum(conf) / len(conf) if conf else 0 for day, conf in day_confidence.items()},
+            'day_distribution': dict(zip(DAY_NAMES, day_counts)),
+            'day_confidence': dict(zip(DAY_NAMES, day_confidence)),
             'confidence': confidence
         }
     
-    def _analyze_session_duration(self, sessions: List) -> Dict[str, Any]:
+    def _analyze_session_duration(self, columns: Dict[str, List]) -> Dict[str, Any]:
         
-        if not sessions:
-            return {'optimal_duration': 30, 'confidence': 0.3}
-        
-        durations = []
-        for session in sessions:
-            if hasattr(session, 'duration_minutes') and session.duration_minutes:
-                durations.append(session.duration_minutes)
+        durations = [duration for duration in columns['durations'] if duration]
         
         if not durations:
             return {'optimal_duration': 30, 'confidence': 0.3}
         
         
-        durations.sort()
-        optimal_duration = durations[len(durations) // 2]
+        optimal_duration = median_high(durations)
         
-        
-        avg_duration = sum(durations) / len(durations)
-        variance = sum((d - avg_duration) ** 2 for d in durations) / len(durations)
+        # Welford's update gives mean and variance in one pass, tracking the range alongside
+        avg_duration = 0.0
+        sum_squares = 0.0
+        shortest = longest = durations[0]
+        for count, duration in enumerate(durations, 1):
+            delta = duration - avg_duration
+            avg_duration += delta / count
+            sum_squares += delta * (duration - avg_duration)
+            shortest = min(shortest, duration)
+            longest = max(longest, duration)
+        variance = sum_squares / len(durations)
         confidence = max(0.3, 1 - (variance / (avg_duration ** 2)))
         
         return {
             'optimal_duration': optimal_duration,
             'average_duration': avg_duration,
-            'duration_range': [min(durations), max(durations)],
+            'duration_range': [shortest, longest],
             'confidence': confidence
         }
     
-    def _analyze_topic_preferences(self, sessions: List) -> Dict[str, Any]:
+    def _analyze_topic_preferences(self, columns: Dict[str, List]) -> Dict[str, Any]:
         
-        if not sessions:
+        if not columns['topic_ids']:
             return {'preferred_topics': [], 'confidence': 0.3}
         
         topic_performance = {}
         
-        for session in sessions:
-            if hasattr(session, 'topic_id') and session.topic_id:
-                topic_id = session.topic_id
+        for topic_id, confidence_after, duration in zip(
+                columns['topic_ids'], columns['confidence_after'], columns['durations']):
+            if topic_id:
                 if topic_id not in topic_performance:
                     topic_performance[topic_id] = {
                         'sessions': 0,
@@ -305,10 +373,10 @@ class SmartSchedulingEngine:
                     }
                 
                 topic_performance[topic_id]['sessions'] += 1
-                if hasattr(session, 'confidence_after') and session.confidence_after:
-                    topic_performance[topic_id]['total_confidence'] += session.confidence_after
-                if hasattr(session, 'duration_minutes') and session.duration_minutes:
-                    topic_performance[topic_id]['total_duration'] += session.duration_minutes
+                if confidence_after:
+                    topic_performance[topic_id]['total_confidence'] += confidence_after
+                if duration:
+                    topic_performance[topic_id]['total_duration'] += duration
         
         
         topic_scores = {}
@@ -318,10 +386,9 @@ class SmartSchedulingEngine:
             topic_scores[topic_id] = data['sessions'] * (1 + avg_confidence / 10) * (1 + avg_duration / 60)
         
         
-        sorted_topics = sorted(topic_scores.items(), key=lambda x: x[1], reverse=True)
-        preferred_topics = [topic_id for topic_id, score in sorted_topics[:5]]
+        preferred_topics = [topic_id for topic_id, score in heapq.nlargest(5, topic_scores.items(), key=itemgetter(1))]
         
-        confidence = min(0.9, len(sessions) / 20)
+        confidence = _sample_confidence(len(columns['topic_ids']), 20)
         
         return {
             'preferred_topics': preferred_topics,
@@ -329,17 +396,13 @@ class SmartSchedulingEngine:
             'confidence': confidence
         }
     
-    def _analyze_confidence_trends(self, sessions: List) -> Dict[str, Any]:
+    def _analyze_confidence_trends(self, columns: Dict[str, List]) -> Dict[str, Any]:
         
-        if not sessions:
-            return {'trend': 'stable', 'confidence': 0.3}
-        
-        confidence_gains = []
-        for session in sessions:
-            if (hasattr(session, 'confidence_before') and session.confidence_before and
-                hasattr(session, 'confidence_after') and session.confidence_after):
-                gain = session.confidence_after - session.confidence_before
-                confidence_gains.append(gain)
+        confidence_gains = [
+            after - before
+            for before, after in zip(columns['confidence_before'], columns['confidence_after'])
+            if before and after
+        ]
         
         if not confidence_gains:
             return {'trend': 'stable', 'confidence': 0.3}
@@ -353,7 +416,7 @@ class SmartSchedulingEngine:
         else:
             trend = 'stable'
         
-        confidence = min(0.9, len(confidence_gains) / 10)
+        confidence = _sample_confidence(len(confidence_gains), 10)
         
         return {
             'trend': trend,
@@ -361,44 +424,31 @@ class SmartSchedulingEngine:
             'confidence': confidence
         }
     
-    def _analyze_study_consistency(self, sessions: List) -> Dict[str, Any]:
+    def _analyze_study_consistency(self, columns: Dict[str, List]) -> Dict[str, Any]:
         
-        if not sessions:
-            return {'consistency_score': 0.3, 'confidence': 0.3}
+        # Sorted distinct days, so streaks are runs of consecutive dates whatever order the sessions came in
+        study_dates = sorted({session_time.date() for session_time in columns['times'] if session_time})
         
+        if not study_dates:
+            return {'consistency_score': 0.3, 'confidence': 0.3}
         
-        current_streak = 0
-        max_streak = 0
-        last_study_date = None
         
-        for session in sessions:
-            if hasattr(session, 'created_at') and session.created_at:
-                try:
-                    if isinstance(session.created_at, str):
-                        session_date = datetime.fromisoformat(session.created_at.replace('Z', '+00:00')).date()
-                    else:
-                        session_date = session.created_at.date()
-                    
-                    if last_study_date is None:
-                        current_streak = 1
-                    elif (session_date - last_study_date).days == 1:
-                        current_streak += 1
-                    elif (session_date - last_study_date).days > 1:
-                        max_streak = max(max_streak, current_streak)
-                        current_streak = 1
-                    
-                    last_study_date = session_date
-                except:
-                    continue
+        current_streak = 1
+        max_streak = 1
         
-        max_streak = max(max_streak, current_streak)
+        for previous_date, session_date in zip(study_dates, study_dates[1:]):
+            if (session_date - previous_date).days == 1:
+                current_streak += 1
+            else:
+                current_streak = 1
+            max_streak = max(max_streak, current_streak)
         
         
-        total_days = (datetime.now().date() - min(session.created_at.date() for session in sessions if hasattr(session, 'created_at'))).days + 1
-        study_days = len(set(session.created_at.date() for session in sessions if hasattr(session, 'created_at')))
+        total_days = (datetime.now().date() - study_dates[0]).days + 1
+        study_days = len(study_dates)
         consistency_score = study_days / total_days if total_days > 0 else 0
         
-        confidence = min(0.9, len(sessions) / 20)
+        confidence = _sample_confidence(len(columns['times']), 20)
         
         return {
             'consistency_score': consistency_score,
@@ -412,8 +462,8 @@ class SmartSchedulingEngine:
     def _get_default_patterns(self) -> Dict[str, Any]:
         
         return {
-            'peak_hours': {'peak_hours': [9, 14, 20], 'confidence': 0.3},
-            'best_days': {'best_days': ['Monday', 'Wednesday', 'Friday'], 'confidence': 0.3},
+            'peak_hours': {'peak_hours': list(DEFAULT_PEAK_HOURS), 'confidence': 0.3},
+            'best_days': {'best_days': list(DEFAULT_BEST_DAYS), 'confidence': 0.3},
             'session_duration': {'optimal_duration': 30, 'confidence': 0.3},
             'topic_preferences': {'preferred_topics': [], 'confidence': 0.3},
             'confidence_trends': {'trend': 'stable', 'confidence': 0.3},
@@ -422,31 +472,30 @@ class SmartSchedulingEngine:
     
     def _is_preferred_day(self, target_date, preferences) -> bool:
         
-        if not preferences.days_of_week:
-            return True
-        
-        
-        weekday = target_date.weekday() + 1
-        return weekday in preferences.days_of_week
+        # An empty mask means no day restriction
+        return not preferences.days_mask or bool(preferences.days_mask & (1 << target_date.weekday()))
     
     def _get_optimal_times_for_day(self, user_id: str, target_date, patterns: Dict[str, Any], 
-                                  preferences) -> List[OptimalStudyTime]:
+                                  preferences, now: datetime = None,
+                                  topics: List = None) -> List[Dict[str, Any]]:
+        
+        now = now or datetime.now()
         
         suggestions = []
         
         
-        peak_hours = patterns.get('peak_hours', {}).get('peak_hours', [9, 14, 20])
+        peak_hours = patterns.get('peak_hours', {}).get('peak_hours', DEFAULT_PEAK_HOURS)
         confidence = patterns.get('peak_hours', {}).get('confidence', 0.5)
         
-        
-        topics = Topic.get_all_by_user(user_id)
+        if topics is None:
+            topics = Topic.get_all_by_user(user_id, limit=3)
         
         for hour in peak_hours:
             
             suggested_time = datetime.combine(target_date, time(hour, 0))
             
             
-            if suggested_time <= datetime.now():
+            if suggested_time <= now:
                 continue
             
             
@@ -457,35 +506,21 @@ class SmartSchedulingEngine:
                 'peak_hour': hour,
                 'pattern_confidence': confidence,
                 'day_of_week': target_date.strftime('%A'),
-                'preferred_time': hour in [9, 14, 20]
+                'preferred_time': hour in DEFAULT_PEAK_HOURS
             }
             
             
-            if topics:
-                for topic in topics[:3]:  
-                    suggestion = OptimalStudyTime.create_suggestion(
-                        user_id=user_id,
-                        suggested_time=suggested_time,
-                        confidence_score=confidence,
-                        reasoning=reasoning,
-                        factors=factors,
-                        topic_id=topic.id,
-                        session_type='review'
-                    )
-                    if suggestion:
-                        suggestions.append(suggestion)
-            else:
-                
-                suggestion = OptimalStudyTime.create_suggestion(
-                    user_id=user_id,
-                    suggested_time=suggested_time,
-                    confidence_score=confidence,
-                    reasoning=reasoning,
-                    factors=factors,
-                    session_type='review'
-                )
-                if suggestion:
-                    suggestions.append(suggestion)
+            # Plain rows; the caller inserts every day's suggestions in one request
+            for topic in (topics[:3] if topics else [None]):
+                suggestions.append({
+                    'user_id': user_id,
+                    'suggested_time': suggested_time,
+                    'confidence_score': confidence,
+                    'reasoning': reasoning,
+                    'factors': factors,
+                    'topic_id': topic.id if topic else None,
+                    'session_type': 'review'
+                })
         
         return suggestions
 
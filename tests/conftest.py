@@ -24,8 +24,9 @@ class _TestLoginUser(UserMixin):
         return 'Test User'
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def app():
+    """One app for the whole run; the factory, blueprints and config are built once."""
     application = create_app('default')
     application.config['TESTING'] = True
     application.config['WTF_CSRF_ENABLED'] = False
@@ -51,6 +52,15 @@ def _clear_in_memory_study_sessions():
     study_session_module._in_memory_sessions.clear()
 
 
+@pytest.fixture
+def mock_supabase_client(monkeypatch):
+    """Mark Supabase available and hand model code a MagicMock client for the test to configure."""
+    client = MagicMock()
+    monkeypatch.setattr('app.models.SUPABASE_AVAILABLE', True)
+    monkeypatch.setattr('app.models.get_supabase_client', lambda: client)
+    return client
+
+
 @pytest.fixture
 def mock_user():
     user = MagicMock()
@@ -0,0 +1,76 @@
+import pytest
+from unittest.mock import MagicMock
+
+from app.utils.ai_tutor import AI_UNAVAILABLE_MESSAGE, AITutor, _study_pattern_cache
+
+
+TUTOR_USER_ID = 'test-user-123'
+
+SESSION_ROWS = [
+    {'created_at': '2024-01-01T09:15:00', 'duration_minutes': 30, 'session_type': 'study',
+     'confidence_before': 4, 'confidence_after': 6},
+    {'created_at': '2024-01-02T20:10:00', 'duration_minutes': 50, 'session_type': 'review',
+     'confidence_before': 5, 'confidence_after': 7},
+]
+
+
+@pytest.fixture(autouse=True)
+def _clear_study_pattern_cache():
+    _study_pattern_cache.clear()
+    yield
+    _study_pattern_cache.clear()
+
+
+@pytest.fixture
+def tutor():
+    tutor = AITutor(TUTOR_USER_ID)
+    tutor.supabase = MagicMock()
+    tutor.supabase.table.return_value.select.return_value.eq.return_value.execute.return_value.data = SESSION_ROWS
+    return tutor
+
+
+class TestStudyPatternCache:
+
+    def test_callers_get_isolated_copies(self, tutor):
+        first = tutor._analyze_study_patterns()
+        first['preferred_times'].append('midnight')
+        first['total_sessions'] = 99
+        second = tutor._analyze_study_patterns()
+
+        assert 'midnight' not in second['preferred_times']
+        assert second['total_sessions'] == len(SESSION_ROWS)
+        # Sessions, quiz attempts and topics are each queried once; the second call is a cache hit
+        assert tutor.supabase.table.call_count == 3
+
+    def test_expired_patterns_are_recomputed(self, tutor, monkeypatch):
+        monkeypatch.setattr(_study_pattern_cache, 'ttl', -1)
+
+        tutor._analyze_study_patterns()
+        tutor._analyze_study_patterns()
+
+        assert tutor.supabase.table.call_count == 6
+
+
+class TestAIUnavailable:
+
+    @pytest.fixture
+    def offline_tutor(self, tutor):
+        tutor.client = None
+        tutor._ai_available = False
+        return tutor
+
+    @pytest.mark.parametrize('call', [
+        pytest.param(lambda tutor: tutor.detect_learning_style(), id='learning-style'),
+        pytest.param(lambda tutor: tutor.get_adaptive_quiz_recommendations('topic-1'), id='adaptive-quiz'),
+    ])
+    def test_ai_only_paths_skip_the_database(self, offline_tutor, call):
+        result = call(offline_tutor)
+
+        assert result == {'error': AI_UNAVAILABLE_MESSAGE}
+        offline_tutor.supabase.table.assert_not_called()
+
+    def test_recommendations_fall_back_without_reading_learning_data(self, offline_tutor):
+        result = offline_tutor.get_personalized_study_recommendations()
+
+        assert result['recommendations'] == offline_tutor._get_default_recommendations()['recommendations']
+        offline_tutor.supabase.table.assert_not_called()
@@ -0,0 +1,60 @@
+import pytest
+from unittest.mock import MagicMock, call, patch
+
+from app.utils import bg_queue
+
+
+@pytest.fixture
+def supabase_client():
+    client = MagicMock()
+    with patch('app.utils.bg_queue.get_supabase_client', return_value=client):
+        yield client
+
+
+class TestBackgroundQueue:
+
+    def test_batch_is_one_insert_per_table(self, supabase_client):
+        bg_queue._write_batch([
+            ('ai_recommendations', {'id': 1}, None),
+            ('ai_interactions', {'id': 2}, None),
+            ('ai_recommendations', {'id': 3}, None),
+        ])
+
+        supabase_client.table.assert_has_calls([call('ai_recommendations'), call('ai_interactions')], any_order=True)
+        assert supabase_client.table.call_count == 2
+        inserts = supabase_client.table.return_value.insert.call_args_list
+        assert inserts == [call([{'id': 1}, {'id': 3}]), call([{'id': 2}])]
+
+    def test_failed_batch_retries_each_row(self, supabase_client):
+        execute = supabase_client.table.return_value.insert.return_value.execute
+        execute.side_effect = [Exception('bad row'), None, Exception('bad row')]
+
+        bg_queue._write_batch([('ai_recommendations', {'id': 1}, None), ('ai_recommendations', {'id': 2}, None)])
+
+        inserts = supabase_client.table.return_value.insert.call_args_list
+        assert inserts == [call([{'id': 1}, {'id': 2}]), call({'id': 1}), call({'id': 2})]
+
+    def test_upserts_keep_the_latest_row_per_conflict_key(self, supabase_client):
+        bg_queue._write_batch([
+            ('study_patterns', {'user_id': 'u1', 'pattern_type': 'peak_hours', 'sample_size': 10}, 'user_id,pattern_type'),
+            ('study_patterns', {'user_id': 'u1', 'pattern_type': 'best_days', 'sample_size': 10}, 'user_id,pattern_type'),
+            ('study_patterns', {'user_id': 'u1', 'pattern_type': 'peak_hours', 'sample_size': 12}, 'user_id,pattern_type'),
+        ])
+
+        table = supabase_client.table.return_value
+        table.insert.assert_not_called()
+        table.upsert.assert_called_once_with([
+            {'user_id': 'u1', 'pattern_type': 'peak_hours', 'sample_size': 12},
+            {'user_id': 'u1', 'pattern_type': 'best_days', 'sample_size': 10},
+        ], on_conflict='user_id,pattern_type')
+
+    def test_flush_waits_for_queued_rows(self, supabase_client, monkeypatch):
+        monkeypatch.setattr(bg_queue, 'BG_QUEUE_FLUSH_SECONDS', 0.01)
+        bg_queue.put('ai_recommendations', {'id': 1})
+        bg_queue.put('ai_recommendations', {'id': 2})
+
+        bg_queue.flush()
+
+        inserted = [row for args in supabase_client.table.return_value.insert.call_args_list
+                    for row in (args.args[0] if isinstance(args.args[0], list) else [args.args[0]])]
+        assert inserted == [{'id': 1}, {'id': 2}]
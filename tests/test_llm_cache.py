@@ -0,0 +1,146 @@
+import sqlite3
+import threading
+
+import pytest
+
+from app.utils.llm_cache import LLMCache, SQLiteCacheStore, SingleFlight, TTLCache, make_cache_key
+
+
+KEY_ARGS = ('gpt-test', 'You are a tutor.', 'Explain fractions.', 200)
+
+
+class TestMakeCacheKey:
+
+    def test_same_request_gives_same_key(self):
+        assert make_cache_key(*KEY_ARGS, 0.7, True) == make_cache_key(*KEY_ARGS, 0.7, True)
+
+    @pytest.mark.parametrize('first, second', [
+        pytest.param({'json_mode': True}, {'json_mode': False}, id='json_mode'),
+        pytest.param({'temperature': 0.2}, {'temperature': 0.7}, id='temperature'),
+    ])
+    def test_sampling_options_change_the_key(self, first, second):
+        assert make_cache_key(*KEY_ARGS, **first) != make_cache_key(*KEY_ARGS, **second)
+
+
+class TestTTLCache:
+
+    def test_expired_entry_is_a_miss(self):
+        cache = TTLCache(ttl=60, max_entries=8)
+        cache.set('fresh', 'value')
+        cache.set('stale', 'value', ttl=-1)
+
+        assert cache.get('fresh') == 'value'
+        assert cache.get('stale') is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache(ttl=60, max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+
+    def test_llm_cache_without_store_behaves_like_ttl_cache(self):
+        cache = LLMCache(ttl=60, max_entries=1)
+        cache.set('a', 'first')
+        cache.set('b', 'second')
+
+        assert cache.get('a') is None
+        assert cache.get('b') == 'second'
+
+
+class TestSQLiteCacheStore:
+
+    def test_value_round_trips_through_the_file(self, tmp_path):
+        path = str(tmp_path / 'llm_cache.sqlite')
+        SQLiteCacheStore(path).set('key', 'cached reply', ttl=60)
+
+        value, ttl_left = SQLiteCacheStore(path).get('key')
+
+        assert value == 'cached reply'
+        assert 0 < ttl_left <= 60
+
+    def test_expired_rows_are_skipped_and_purged(self, tmp_path, monkeypatch):
+        path = str(tmp_path / 'llm_cache.sqlite')
+        store = SQLiteCacheStore(path)
+        monkeypatch.setattr(store, 'PURGE_EVERY', 2)
+
+        store.set('stale', 'old reply', ttl=-1)
+        assert store.get('stale') is None
+        store.set('fresh', 'new reply', ttl=60)
+
+        with sqlite3.connect(path) as conn:
+            keys = [row[0] for row in conn.execute('SELECT key FROM llm_cache')]
+        assert keys == ['fresh']
+
+    def test_llm_cache_reads_through_to_the_store(self, tmp_path):
+        store = SQLiteCacheStore(str(tmp_path / 'llm_cache.sqlite'))
+        LLMCache(ttl=60, max_entries=8, store=store).set('key', 'shared reply')
+
+        other_worker = LLMCache(ttl=60, max_entries=8, store=store)
+
+        assert other_worker.get('key') == 'shared reply'
+        assert other_worker.hits == 1
+
+
+class TestSingleFlight:
+
+    def _run_with_follower(self, leader_fn):
+        """Run leader_fn as the leader for one key while a second thread asks for the same key."""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        follower_calls = []
+        outcomes = {}
+
+        def leader_body():
+            started.set()
+            release.wait(5)
+            return leader_fn()
+
+        def call(name, fn):
+            try:
+                outcomes[name] = ('result', flight.do('key', fn))
+            except Exception as e:
+                outcomes[name] = ('error', e)
+
+        leader = threading.Thread(target=call, args=('leader', leader_body))
+        leader.start()
+        assert started.wait(5)
+        follower = threading.Thread(target=call, args=('follower', lambda: follower_calls.append(1)))
+        follower.start()
+        # The follower must still be waiting on the leader's call, not running its own
+        follower.join(0.1)
+        assert follower.is_alive()
+        release.set()
+        leader.join(5)
+        follower.join(5)
+
+        assert follower_calls == []
+        return outcomes
+
+    def test_follower_gets_leader_result(self):
+        outcomes = self._run_with_follower(lambda: 'answer')
+
+        assert outcomes['leader'] == ('result', 'answer')
+        assert outcomes['follower'] == ('result', 'answer')
+
+    def test_follower_gets_leader_exception(self):
+        def fail():
+            raise RuntimeError('upstream failed')
+
+        outcomes = self._run_with_follower(fail)
+
+        assert outcomes['leader'][0] == 'error'
+        assert outcomes['follower'][0] == 'error'
+        assert outcomes['follower'][1] is outcomes['leader'][1]
+
+    def test_key_is_released_after_the_call(self):
+        flight = SingleFlight()
+
+        assert flight.do('key', lambda: 'first') == 'first'
+        assert flight.do('key', lambda: 'second') == 'second'
@@ -0,0 +1,92 @@
+import pytest
+
+from app.utils import openai_limiter as limiter_module
+from app.utils.openai_limiter import OpenAIRateLimiter
+
+
+class FakeClock:
+    """Stands in for the time module: sleeping advances the clock instead of waiting."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(limiter_module, 'time', fake)
+    return fake
+
+
+def _limiter(requests=60, tokens=600, concurrent=2):
+    return OpenAIRateLimiter(max_requests_per_minute=requests, max_tokens_per_minute=tokens,
+                             max_concurrent=concurrent)
+
+
+class TestOpenAIRateLimiter:
+
+    def test_budget_refills_with_elapsed_time(self, clock):
+        limiter = _limiter()
+        limiter.acquire(300)
+        limiter.acquire(300)
+
+        clock.advance(30)
+        limiter.acquire(300)
+
+        assert clock.sleeps == []
+        assert limiter.available_token_capacity == pytest.approx(0)
+
+    def test_refill_is_capped_at_the_bucket_size(self, clock):
+        limiter = _limiter()
+        limiter.acquire(600)
+
+        clock.advance(600)
+        limiter.acquire(0)
+
+        assert limiter.available_token_capacity == pytest.approx(600)
+
+    def test_blocks_until_tokens_refill(self, clock):
+        limiter = _limiter()
+        limiter.acquire(600)
+
+        limiter.acquire(300)
+
+        assert sum(clock.sleeps) == pytest.approx(30)
+
+    def test_blocks_until_a_request_refills(self, clock):
+        limiter = _limiter(requests=2)
+        limiter.acquire(1)
+        limiter.acquire(1)
+
+        limiter.acquire(1)
+
+        assert sum(clock.sleeps) == pytest.approx(30)
+
+    def test_oversized_request_waits_for_a_full_bucket(self, clock):
+        limiter = _limiter()
+        limiter.acquire(100)
+
+        limiter.acquire(10_000)
+
+        assert sum(clock.sleeps) == pytest.approx(10)
+        assert limiter.available_token_capacity == pytest.approx(0)
+
+    def test_slot_is_released_when_the_call_raises(self, clock):
+        limiter = _limiter(concurrent=1)
+
+        with pytest.raises(RuntimeError):
+            with limiter.reserve(10):
+                raise RuntimeError('API error')
+
+        assert limiter._slots.acquire(blocking=False)
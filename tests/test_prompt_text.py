@@ -0,0 +1,54 @@
+import pytest
+
+from app.utils.prompt_text import parse_json_object, truncate_for_prompt
+
+
+class TestParseJsonObject:
+
+    @pytest.mark.parametrize('content, expected', [
+        pytest.param('{"style": "visual"}', {'style': 'visual'}, id='plain'),
+        pytest.param('```json\n{"style": "visual"}\n```', {'style': 'visual'}, id='fenced'),
+        pytest.param('Here is the plan:\n{"weeks": [1, 2]}\nLet me know if {this} helps.',
+                     {'weeks': [1, 2]}, id='prose-wrapped'),
+        pytest.param('Note {not json} then {"ok": true}', {'ok': True}, id='skips-bad-brace'),
+        pytest.param('[{"style": "visual"}]', None, id='top-level-array'),
+        pytest.param('{"style": "visual"', None, id='truncated'),
+        pytest.param('No structured data here.', None, id='no-object'),
+        pytest.param('', None, id='empty'),
+        pytest.param(None, None, id='none'),
+    ])
+    def test_parse_json_object(self, content, expected):
+        assert parse_json_object(content) == expected
+
+
+class TestTruncateForPrompt:
+
+    def test_whitespace_is_collapsed(self):
+        assert truncate_for_prompt('  Cell\n\n  biology\tbasics  ') == 'Cell biology basics'
+
+    @pytest.mark.parametrize('text', [None, ''])
+    def test_missing_text_is_empty(self, text):
+        assert truncate_for_prompt(text) == ''
+
+    def test_text_at_the_limit_is_kept(self):
+        text = 'word ' * 3 + 'end'
+
+        assert truncate_for_prompt(text, max_chars=len(text)) == text
+
+    def test_text_over_the_limit_is_cut_at_a_word(self):
+        text = 'word ' * 3 + 'end'
+
+        assert truncate_for_prompt(text, max_chars=len(text) - 1) == 'word word word…'
+
+    def test_text_over_the_limit_prefers_a_sentence_end(self):
+        text = 'Cells divide by mitosis. Each daughter cell gets a full copy.'
+
+        assert truncate_for_prompt(text, max_chars=40) == 'Cells divide by mitosis.…'
+
+    def test_early_sentence_end_falls_back_to_a_word(self):
+        text = 'Cells. Each daughter cell gets a full copy of the genome.'
+
+        assert truncate_for_prompt(text, max_chars=40) == 'Cells. Each daughter cell gets a full…'
+
+    def test_long_unbroken_text_is_cut_at_the_limit(self):
+        assert truncate_for_prompt('a' * 10, max_chars=4) == 'aaaa…'
@@ -0,0 +1,43 @@
+import logging
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.utils.question_generator import SmartQuestionGenerator
+
+
+@pytest.fixture
+def openai_client():
+    client = MagicMock()
+    with patch.object(SmartQuestionGenerator, 'get_openai_client', return_value=client):
+        yield client
+
+
+def _reply(client, content, finish_reason='stop'):
+    choice = MagicMock(finish_reason=finish_reason)
+    choice.message.content = content
+    client.chat.completions.create.return_value.choices = [choice]
+
+
+class TestAIQuizGeneration:
+
+    @pytest.mark.parametrize('num_questions, expected_max_tokens', [
+        pytest.param(5, 2000, id='floor'),
+        pytest.param(20, 7200, id='scaled'),
+    ])
+    def test_token_budget_scales_with_question_count(self, openai_client, num_questions, expected_max_tokens):
+        _reply(openai_client, '{}')
+
+        SmartQuestionGenerator._generate_ai_quiz('Fractions', 'Adding fractions', num_questions, 'medium', ['multiple_choice'])
+
+        assert openai_client.chat.completions.create.call_args.kwargs['max_tokens'] == expected_max_tokens
+
+    def test_truncated_reply_is_logged(self, openai_client, caplog):
+        _reply(openai_client, '{"questions": [{"question": "What is 1/2 + 1/4', finish_reason='length')
+
+        with caplog.at_level(logging.WARNING, logger='app.utils.question_generator'):
+            quiz = SmartQuestionGenerator._generate_ai_quiz('Fractions', 'Adding fractions', 5, 'medium', ['multiple_choice'])
+
+        assert quiz is None
+        assert any(record.levelno == logging.WARNING and 'token limit' in record.getMessage()
+                   for record in caplog.records)
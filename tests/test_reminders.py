@@ -0,0 +1,20 @@
+from unittest.mock import MagicMock, patch
+
+
+class TestSmartScheduleRoute:
+
+    @patch('app.routes.reminders.render_template', return_value='')
+    @patch('app.models.Topic.get_all_by_user', return_value=[])
+    @patch('app.routes.reminders.SmartSchedulingEngine')
+    @patch('app.routes.reminders.get_current_user', return_value=MagicMock(id='test-user-id'))
+    def test_patterns_are_analyzed_once(self, mock_user, mock_engine_class, mock_topics, mock_render, logged_in_client):
+        engine = mock_engine_class.return_value
+
+        response = logged_in_client.get('/reminders/smart-schedule')
+
+        assert response.status_code == 200
+        engine.analyze_study_patterns.assert_called_once_with('test-user-id')
+        engine.suggest_optimal_study_times.assert_called_once_with(
+            'test-user-id', days_ahead=7, patterns=engine.analyze_study_patterns.return_value
+        )
+        assert mock_render.call_args.kwargs['patterns'] is engine.analyze_study_patterns.return_value
@@ -11,6 +11,83 @@ from app.forms.session_forms import StartSessionForm, CompleteSessionForm, EditS
 TopicStub = namedtuple('TopicStub', ['id', 'title'])
 FORM_TOPIC_CHOICES = [TopicStub('1', 'Topic One')]
 
+TODAY = date.today()
+YESTERDAY = TODAY - timedelta(days=1)
+TOMORROW = TODAY + timedelta(days=1)
+WEEK_AGO = TODAY - timedelta(days=7)
+
+# The longest notes the session forms accept
+LONG_NOTES = 'A' * 1000
+
+SEED_USER_ID = 'test-user-123'
+
+# Baseline create_session arguments; tests pass only the fields they care about
+SESSION_DEFAULTS = {
+    'user_id': SEED_USER_ID,
+    'topic_id': 1,
+    'session_date': TODAY,
+    'duration_minutes': 25,
+    'confidence_before': 5,
+    'confidence_after': 7,
+    'notes': 'Test session',
+    'session_type': 'study'
+}
+
+
+def _make_session(**overrides):
+    return StudySession.create_session(**{**SESSION_DEFAULTS, **overrides})
+
+# (form class, constructor kwargs, data, should validate, fields expected in form.errors)
+SESSION_FORM_CASES = [
+    pytest.param(StartSessionForm, {}, None, False,
+                 ['topic_id', 'session_type', 'confidence_before'], id='start-empty'),
+    pytest.param(StartSessionForm, {'topics': FORM_TOPIC_CHOICES}, {
+        'topic_id': '1',
+        'session_type': 'study',
+        'confidence_before': 5,
+        'estimated_duration': 25
+    }, True, [], id='start-valid'),
+    pytest.param(StartSessionForm, {'topics': FORM_TOPIC_CHOICES}, {
+        'topic_id': '1',
+        'session_type': 'study',
+        'confidence_before': 15,
+        'estimated_duration': 25
+    }, False, ['confidence_before'], id='start-invalid-confidence'),
+    pytest.param(CompleteSessionForm, {}, None, False,
+                 ['duration_minutes', 'confidence_after'], id='complete-empty'),
+    pytest.param(CompleteSessionForm, {}, {
+        'duration_minutes': 25,
+        'confidence_after': 7,
+        'notes': 'Great session!',
+        'completed': True
+    }, True, [], id='complete-valid'),
+    pytest.param(EditSessionForm, {}, None, False,
+                 ['duration_minutes', 'confidence_before', 'confidence_after', 'session_type'], id='edit-empty'),
+    pytest.param(EditSessionForm, {}, {
+        'session_date': TOMORROW,
+        'duration_minutes': 25,
+        'confidence_before': 5,
+        'confidence_after': 7,
+        'session_type': 'study'
+    }, False, ['session_date'], id='edit-future-date'),
+]
+
+
+@pytest.fixture
+def seeded_sessions():
+    """Today's study session and yesterday's review of topic 1 for SEED_USER_ID."""
+    return [
+        _make_session(notes='Session 1'),
+        _make_session(
+            session_date=YESTERDAY,
+            duration_minutes=30,
+            confidence_before=6,
+            confidence_after=8,
+            notes='Session 2',
+            session_type='review'
+        ),
+    ]
+
 
 class TestStudySessionModel:
     
@@ -23,7 +100,7 @@ class TestStudySessionModel:
         session = StudySession.create_session(
             user_id=user_id,
             topic_id=topic_id,
-            session_date=date.today(),
+            session_date=TODAY,
             duration_minutes=25,
             confidence_before=5,
             confidence_after=7,
@@ -42,34 +119,9 @@ class TestStudySessionModel:
         assert session.session_type == 'study'
         assert session.completed == True
     
-    def test_get_user_sessions(self):
+    def test_get_user_sessions(self, seeded_sessions):
         
-        user_id = 'test-user-123'
-        
-        
-        session1 = StudySession.create_session(
-            user_id=user_id,
-            topic_id=1,
-            session_date=date.today(),
-            duration_minutes=25,
-            confidence_before=5,
-            confidence_after=7,
-            notes='Session 1',
-            session_type='study'
-        )
-        
-        session2 = StudySession.create_session(
-            user_id=user_id,
-            topic_id=2,
-            session_date=date.today() - timedelta(days=1),
-            duration_minutes=30,
-            confidence_before=6,
-            confidence_after=8,
-            notes='Session 2',
-            session_type='review'
-        )
-        
-        sessions = StudySession.get_user_sessions(user_id)
+        sessions = StudySession.get_user_sessions(SEED_USER_ID)
         
         assert len(sessions) >= 2
         
@@ -81,21 +133,10 @@ class TestStudySessionModel:
         topic_id = 1
         
         
-        session1 = StudySession.create_session(
-            user_id=user_id,
-            topic_id=topic_id,
-            session_date=date.today(),
-            duration_minutes=25,
-            confidence_before=5,
-            confidence_after=7,
-            notes='Topic 1 session',
-            session_type='study'
-        )
-        
-        session2 = StudySession.create_session(
+        _make_session(user_id=user_id, topic_id=topic_id, notes='Topic 1 session')
+        _make_session(
             user_id=user_id,
-            topic_id=2,  
-            session_date=date.today(),
+            topic_id=2,
             duration_minutes=30,
             confidence_before=6,
             confidence_after=8,
@@ -113,15 +154,9 @@ class TestStudySessionModel:
         
         user_id = 'test-user-123'
         
-        session = StudySession.create_session(
+        session = _make_session(
             user_id=user_id,
-            topic_id=1,
-            session_date=date.today(),
-            duration_minutes=25,
-            confidence_before=5,
-            confidence_after=7,
-            notes='Test session',
-            session_type='study'
+            notes='Test session'
         )
         
         retrieved_session = StudySession.get_session_by_id(session.id, user_id)
@@ -134,15 +169,9 @@ class TestStudySessionModel:
         
         user_id = 'test-user-123'
         
-        session = StudySession.create_session(
+        session = _make_session(
             user_id=user_id,
-            topic_id=1,
-            session_date=date.today(),
-            duration_minutes=25,
-            confidence_before=5,
-            confidence_after=7,
-            notes='Original notes',
-            session_type='study'
+            notes='Original notes'
         )
         
         
@@ -161,15 +190,9 @@ class TestStudySessionModel:
         
         user_id = 'test-user-123'
         
-        session = StudySession.create_session(
+        session = _make_session(
             user_id=user_id,
-            topic_id=1,
-            session_date=date.today(),
-            duration_minutes=25,
-            confidence_before=5,
-            confidence_after=7,
-            notes='To be deleted',
-            session_type='study'
+            notes='To be deleted'
         )
         
         session_id = session.id
@@ -179,9 +202,8 @@ class TestStudySessionModel:
         
         assert success == True
         
-        
-        deleted_session = StudySession.get_session_by_id(session_id, user_id)
-        assert deleted_session is None
+        # delete_session reports whether a row went away, so a repeat delete finds nothing
+        assert StudySession.delete_session(session_id, user_id) == False
     
     def test_calculate_confidence_gain(self):
         
@@ -189,7 +211,7 @@ class TestStudySessionModel:
             id=1,
             topic_id=1,
             user_id='test-user',
-            session_date=date.today(),
+            session_date=TODAY,
             duration_minutes=25,
             confidence_before=5,
             confidence_after=8,
@@ -201,34 +223,9 @@ class TestStudySessionModel:
         gain = session.calculate_confidence_gain()
         assert gain == 3
     
-    def test_get_session_stats(self):
-        
-        user_id = 'test-user-123'
-        
-        
-        StudySession.create_session(
-            user_id=user_id,
-            topic_id=1,
-            session_date=date.today(),
-            duration_minutes=25,
-            confidence_before=5,
-            confidence_after=7,
-            notes='Session 1',
-            session_type='study'
-        )
-        
-        StudySession.create_session(
-            user_id=user_id,
-            topic_id=2,
-            session_date=date.today() - timedelta(days=1),
-            duration_minutes=30,
-            confidence_before=6,
-            confidence_after=8,
-            notes='Session 2',
-            session_type='review'
-        )
+    def test_get_session_stats(self, seeded_sessions):
         
-        stats = StudySession.get_session_stats(user_id, days=30)
+        stats = StudySession.get_session_stats(SEED_USER_ID, days=30)
         
         assert 'total_sessions' in stats
         assert 'total_time_minutes' in stats
@@ -242,35 +239,9 @@ class TestStudySessionModel:
         assert stats['total_time_minutes'] >= 55  
         assert stats['total_time_hours'] >= 0.9  
     
-    def test_get_topic_progress(self):
-        
-        user_id = 'test-user-123'
-        topic_id = 1
+    def test_get_topic_progress(self, seeded_sessions):
         
-        
-        StudySession.create_session(
-            user_id=user_id,
-            topic_id=topic_id,
-            session_date=date.today(),
-            duration_minutes=25,
-            confidence_before=5,
-            confidence_after=7,
-            notes='Session 1',
-            session_type='study'
-        )
-        
-        StudySession.create_session(
-            user_id=user_id,
-            topic_id=topic_id,
-            session_date=date.today() - timedelta(days=1),
-            duration_minutes=30,
-            confidence_before=6,
-            confidence_after=8,
-            notes='Session 2',
-            session_type='review'
-        )
-        
-        progress = StudySession.get_topic_progress(topic_id, user_id)
+        progress = StudySession.get_topic_progress(1, SEED_USER_ID)
         
         assert 'total_sessions' in progress
         assert 'total_time_minutes' in progress
@@ -284,147 +255,31 @@ class TestStudySessionModel:
         assert progress['total_time_minutes'] >= 55
         assert progress['confidence_improvement'] >= 4  
     
-    def test_get_session_streak(self):
-        
-        user_id = 'test-user-123'
-        
+    def test_get_session_streak(self, seeded_sessions):
         
-        StudySession.create_session(
-            user_id=user_id,
-            topic_id=1,
-            session_date=date.today(),
-            duration_minutes=25,
-            confidence_before=5,
-            confidence_after=7,
-            notes='Today',
-            session_type='study'
-        )
-        
-        StudySession.create_session(
-            user_id=user_id,
-            topic_id=2,
-            session_date=date.today() - timedelta(days=1),
-            duration_minutes=30,
-            confidence_before=6,
-            confidence_after=8,
-            notes='Yesterday',
-            session_type='review'
-        )
-        
-        streak = StudySession.get_session_streak(user_id)
+        streak = StudySession.get_session_streak(SEED_USER_ID)
         assert streak >= 2
     
     def test_get_weekly_study_time(self):
         
-        user_id = 'test-user-123'
-        
-        
-        StudySession.create_session(
-            user_id=user_id,
-            topic_id=1,
-            session_date=date.today(),
-            duration_minutes=25,
-            confidence_before=5,
-            confidence_after=7,
-            notes='This week',
-            session_type='study'
-        )
-        
-        StudySession.create_session(
-            user_id=user_id,
-            topic_id=2,
-            session_date=date.today() - timedelta(days=2),
-            duration_minutes=30,
-            confidence_before=6,
-            confidence_after=8,
-            notes='This week too',
-            session_type='review'
-        )
+        # Both sessions today: on a Monday yesterday already belongs to last week
+        _make_session(notes='Session 1')
+        _make_session(duration_minutes=30, notes='Session 2', session_type='review')
         
-        weekly_time = StudySession.get_weekly_study_time(user_id)
+        weekly_time = StudySession.get_weekly_study_time(SEED_USER_ID)
         assert weekly_time >= 55  
 
 
 class TestSessionForms:
     
     
-    def test_start_session_form_validation(self):
+    @pytest.mark.parametrize('form_class, form_kwargs, data, expect_valid, error_keys', SESSION_FORM_CASES)
+    def test_session_form_validation(self, form_class, form_kwargs, data, expect_valid, error_keys):
         
-        form = StartSessionForm()
+        form = form_class(data=data, **form_kwargs)
         
-        
-        assert not form.validate()
-        assert 'topic_id' in form.errors
-        assert 'session_type' in form.errors
-        assert 'confidence_before' in form.errors
-    
-    def test_start_session_form_valid_data(self):
-        
-        form = StartSessionForm(topics=FORM_TOPIC_CHOICES, data={
-            'topic_id': '1',
-            'session_type': 'study',
-            'confidence_before': 5,
-            'estimated_duration': 25
-        })
-        
-        assert form.validate()
-    
-    def test_start_session_form_invalid_confidence(self):
-        
-        form = StartSessionForm(topics=FORM_TOPIC_CHOICES, data={
-            'topic_id': '1',
-            'session_type': 'study',
-            'confidence_before': 15,
-            'estimated_duration': 25
-        })
-        
-        assert not form.validate()
-        assert 'confidence_before' in form.errors
-    
-    def test_complete_session_form_validation(self):
-        
-        form = CompleteSessionForm()
-        
-        
-        assert not form.validate()
-        assert 'duration_minutes' in form.errors
-        assert 'confidence_after' in form.errors
-    
-    def test_complete_session_form_valid_data(self):
-        
-        form = CompleteSessionForm(data={
-            'duration_minutes': 25,
-            'confidence_after': 7,
-            'notes': 'Great session!',
-            'completed': True
-        })
-        
-        assert form.validate()
-    
-    def test_edit_session_form_validation(self):
-        
-        form = EditSessionForm()
-        
-        
-        assert not form.validate()
-        assert 'duration_minutes' in form.errors
-        assert 'confidence_before' in form.errors
-        assert 'confidence_after' in form.errors
-        assert 'session_type' in form.errors
-    
-    def test_edit_session_form_future_date(self):
-        
-        future_date = date.today() + timedelta(days=1)
-        form = EditSessionForm(data={
-            'session_date': future_date,
-            'duration_minutes': 25,
-            'confidence_before': 5,
-            'confidence_after': 7,
-            'session_type': 'study'
-        })
-        
-        assert not form.validate()
-        assert 'session_date' in form.errors
+        assert form.validate() == expect_valid
+        assert set(error_keys) <= form.errors.keys()
     
     def test_session_filter_form(self):
         
@@ -437,22 +292,26 @@ class TestSessionForms:
         form = SessionFilterForm(topics=FORM_TOPIC_CHOICES, data={
             'topic_id': '1',
             'session_type': 'study',
-            'date_from': date.today() - timedelta(days=7),
-            'date_to': date.today()
+            'date_from': WEEK_AGO,
+            'date_to': TODAY
         })
         
         assert form.validate()
     
-    def test_session_filter_form_invalid_date_range(self):
-        start = date.today()
-        end = date.today() - timedelta(days=1)
+    @pytest.mark.parametrize('start, end, valid', [
+        pytest.param(TODAY, YESTERDAY, False, id='start-after-end'),
+        pytest.param(TODAY, TODAY, True, id='same-day'),
+        pytest.param(TODAY, TOMORROW, True, id='future-end'),
+        pytest.param(WEEK_AGO, TODAY, True, id='start-before-end'),
+    ])
+    def test_session_filter_form_date_range(self, start, end, valid):
         form = SessionFilterForm(formdata=MultiDict([
             ('date_from', start.isoformat()),
             ('date_to', end.isoformat()),
         ]))
         
-        assert not form.validate()
-        assert 'date_to' in form.errors
+        assert form.validate() is valid
+        assert ('date_to' in form.errors) is not valid
 
 
 class TestSessionIntegration:
@@ -465,15 +324,10 @@ class TestSessionIntegration:
         topic_id = 1
         
         
-        session = StudySession.create_session(
+        session = _make_session(
             user_id=user1_id,
             topic_id=topic_id,
-            session_date=date.today(),
-            duration_minutes=25,
-            confidence_before=5,
-            confidence_after=7,
-            notes='User 1 session',
-            session_type='study'
+            notes='User 1 session'
         )
         
         
@@ -485,43 +339,17 @@ class TestSessionIntegration:
         user2_session = StudySession.get_session_by_id(session.id, user2_id)
         assert user2_session is None
     
-    def test_session_topic_relationship(self):
-        
-        user_id = 'test-user-123'
-        topic_id = 1
-        
-        
-        session = StudySession.create_session(
-            user_id=user_id,
-            topic_id=topic_id,
-            session_date=date.today(),
-            duration_minutes=25,
-            confidence_before=5,
-            confidence_after=7,
-            notes='Topic session',
-            session_type='study'
-        )
-        
-        
-        topic_sessions = StudySession.get_topic_sessions(topic_id, user_id)
-        assert len(topic_sessions) >= 1
-        assert topic_sessions[0].topic_id == topic_id
-    
     def test_session_completion_workflow(self):
         
         user_id = 'test-user-123'
         topic_id = 1
         
         
-        session = StudySession.create_session(
+        session = _make_session(
             user_id=user_id,
             topic_id=topic_id,
-            session_date=date.today(),
-            duration_minutes=25,
-            confidence_before=5,
-            confidence_after=None,  
+            confidence_after=None,
             notes='',
-            session_type='study',
             completed=False
         )
         
@@ -544,58 +372,33 @@ class TestSessionIntegration:
 class TestSessionEdgeCases:
     
     
-    def test_session_with_none_values(self):
-        
-        user_id = 'test-user-123'
-        
-        session = StudySession.create_session(
-            user_id=user_id,
-            topic_id=1,
-            session_date=date.today(),
-            duration_minutes=25,
-            confidence_before=5,
-            confidence_after=None,
-            notes=None,
-            session_type='study',
-            completed=False
-        )
-        
-        assert session is not None
-        assert session.confidence_after is None
-        assert session.notes == ''  
-    
-    def test_session_with_empty_strings(self):
+    @pytest.mark.parametrize('notes_in, confidence_after, completed', [
+        pytest.param(None, None, False, id='none'),
+        pytest.param('', 7, True, id='empty'),
+    ])
+    def test_session_with_empty_notes(self, notes_in, confidence_after, completed):
         
-        user_id = 'test-user-123'
-        
-        session = StudySession.create_session(
-            user_id=user_id,
-            topic_id=1,
-            session_date=date.today(),
-            duration_minutes=25,
-            confidence_before=5,
-            confidence_after=7,
-            notes='',
-            session_type='study',
-            completed=True
+        session = _make_session(
+            user_id='test-user-123',
+            confidence_after=confidence_after,
+            notes=notes_in,
+            completed=completed
         )
         
         assert session is not None
+        assert session.confidence_after == confidence_after
         assert session.notes == ''
     
     def test_session_with_extreme_values(self):
         
         user_id = 'test-user-123'
         
-        session = StudySession.create_session(
+        session = _make_session(
             user_id=user_id,
-            topic_id=1,
-            session_date=date.today(),
-            duration_minutes=480,  
+            duration_minutes=480,
             confidence_before=1,
             confidence_after=10,
-            notes='A' * 1000,  
-            session_type='study',
+            notes=LONG_NOTES,
             completed=True
         )
         
@@ -603,7 +406,7 @@ class TestSessionEdgeCases:
         assert session.duration_minutes == 480
         assert session.confidence_before == 1
         assert session.confidence_after == 10
-        assert len(session.notes) == 1000
+        assert session.notes == LONG_NOTES
     
     def test_session_stats_with_no_sessions(self):
         
@@ -0,0 +1,200 @@
+import pytest
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+from app.models.reminders import StudyReminderPreferences
+from app.utils.smart_scheduling import SmartSchedulingEngine, _pattern_cache
+
+
+SCHEDULE_USER_ID = 'test-user-123'
+
+# Rows as StudySession.get_user_session_rows returns them from Supabase
+PATTERN_ROWS = [
+    {'created_at': '2024-01-01T09:15:00Z', 'duration_minutes': 30, 'topic_id': 'topic-1',
+     'confidence_before': 4, 'confidence_after': 6},
+    {'created_at': '2024-01-03T09:45:00Z', 'duration_minutes': 40, 'topic_id': 'topic-1',
+     'confidence_before': 5, 'confidence_after': 7},
+    {'created_at': '2024-01-03T20:10:00Z', 'duration_minutes': 20, 'topic_id': 'topic-2',
+     'confidence_before': 6, 'confidence_after': 6},
+]
+
+
+@pytest.fixture(autouse=True)
+def _clear_pattern_cache():
+    _pattern_cache.clear()
+    yield
+    _pattern_cache.clear()
+
+
+@pytest.fixture
+def session_rows():
+    with patch('app.utils.smart_scheduling.StudySession.get_user_session_rows',
+               return_value=PATTERN_ROWS) as mock_rows:
+        yield mock_rows
+
+
+class TestScheduleStudySession:
+
+    @pytest.mark.parametrize('topic_id', [None, 'topic-1'])
+    @patch('app.utils.smart_scheduling.StudySchedule.create_schedule')
+    @patch('app.utils.smart_scheduling.Topic')
+    def test_schedule_survives_topic_lookup_failure(self, mock_topic_model, mock_create, topic_id):
+        mock_topic_model.get_by_id.side_effect = Exception('Supabase not available')
+        mock_topic_model.get_all_by_user.side_effect = Exception('Supabase not available')
+        before = datetime.now()
+
+        schedule = SmartSchedulingEngine().schedule_study_session(
+            SCHEDULE_USER_ID, topic_id=topic_id, duration_minutes=45
+        )
+
+        assert schedule is mock_create.return_value
+        kwargs = mock_create.call_args.kwargs
+        assert kwargs['title'] == 'Review Session: General Study'
+        assert kwargs['topic_id'] == topic_id
+        assert kwargs['scheduled_start'] >= before + timedelta(hours=1)
+        assert kwargs['scheduled_end'] - kwargs['scheduled_start'] == timedelta(minutes=45)
+
+    @patch('app.utils.smart_scheduling.StudySchedule.create_schedule')
+    @patch('app.utils.smart_scheduling.Topic')
+    def test_schedule_uses_topic_title(self, mock_topic_model, mock_create):
+        mock_topic_model.get_by_id.return_value.title = 'Algebra'
+        mock_topic_model.get_all_by_user.side_effect = Exception('Supabase not available')
+
+        SmartSchedulingEngine().schedule_study_session(SCHEDULE_USER_ID, topic_id='topic-1')
+
+        mock_topic_model.get_by_id.assert_called_once_with('topic-1', SCHEDULE_USER_ID)
+        assert mock_create.call_args.kwargs['title'] == 'Review Session: Algebra'
+
+
+class TestPatternCache:
+
+    def test_repeat_analysis_is_served_from_cache(self, session_rows):
+        engine = SmartSchedulingEngine()
+
+        first = engine.analyze_study_patterns(SCHEDULE_USER_ID)
+        second = engine.analyze_study_patterns(SCHEDULE_USER_ID)
+
+        assert second == first
+        session_rows.assert_called_once()
+
+    def test_callers_get_isolated_copies(self, session_rows):
+        engine = SmartSchedulingEngine()
+
+        first = engine.analyze_study_patterns(SCHEDULE_USER_ID)
+        first['peak_hours']['peak_hours'].append(99)
+        second = engine.analyze_study_patterns(SCHEDULE_USER_ID)
+        second['best_days']['best_days'].clear()
+        third = engine.analyze_study_patterns(SCHEDULE_USER_ID)
+
+        assert 99 not in second['peak_hours']['peak_hours']
+        assert third['best_days']['best_days']
+        session_rows.assert_called_once()
+
+    def test_expired_patterns_are_recomputed(self, session_rows, monkeypatch):
+        monkeypatch.setattr(_pattern_cache, 'ttl', -1)
+        engine = SmartSchedulingEngine()
+
+        engine.analyze_study_patterns(SCHEDULE_USER_ID)
+        engine.analyze_study_patterns(SCHEDULE_USER_ID)
+
+        assert session_rows.call_count == 2
+
+
+class TestAnalyzeStudyPatterns:
+
+    def test_patterns_are_queued_as_independent_copies(self):
+        rows = PATTERN_ROWS * 4
+        with patch('app.utils.smart_scheduling.StudySession.get_user_session_rows', return_value=rows), \
+                patch('app.utils.smart_scheduling.bg_queue.put') as mock_put:
+            patterns = SmartSchedulingEngine().analyze_study_patterns(SCHEDULE_USER_ID)
+
+        queued = {call.args[1]['pattern_type']: call.args[1] for call in mock_put.call_args_list}
+        assert set(queued) == set(patterns)
+        assert all(call.args[0] == 'study_patterns' for call in mock_put.call_args_list)
+        assert all(call.kwargs['on_conflict'] == 'user_id,pattern_type' for call in mock_put.call_args_list)
+        assert queued['peak_hours']['sample_size'] == len(rows)
+
+        patterns['peak_hours']['peak_hours'].append(99)
+        assert 99 not in queued['peak_hours']['pattern_data']['peak_hours']
+
+    def test_small_histories_are_not_stored(self, session_rows):
+        with patch('app.utils.smart_scheduling.bg_queue.put') as mock_put:
+            SmartSchedulingEngine().analyze_study_patterns(SCHEDULE_USER_ID)
+
+        mock_put.assert_not_called()
+
+    def test_patterns_from_fixed_rows(self, session_rows):
+        patterns = SmartSchedulingEngine().analyze_study_patterns(SCHEDULE_USER_ID)
+
+        assert patterns['peak_hours']['peak_hours'] == [9, 20]
+        assert patterns['peak_hours']['hour_distribution'] == {9: 2, 20: 1}
+        assert patterns['peak_hours']['confidence'] == pytest.approx(0.9)
+
+        assert patterns['best_days']['best_days'] == ['Wednesday', 'Monday']
+        assert patterns['best_days']['day_confidence']['Wednesday'] == pytest.approx(6.5)
+        assert patterns['best_days']['confidence'] == pytest.approx(0.3)
+
+        assert patterns['session_duration']['optimal_duration'] == 30
+        assert patterns['session_duration']['duration_range'] == [20, 40]
+
+        assert patterns['topic_preferences']['preferred_topics'] == ['topic-1', 'topic-2']
+        assert patterns['topic_preferences']['confidence'] == pytest.approx(0.15)
+
+        assert patterns['confidence_trends']['trend'] == 'improving'
+        assert patterns['confidence_trends']['average_gain'] == pytest.approx(4 / 3)
+        assert patterns['confidence_trends']['confidence'] == pytest.approx(0.3)
+
+    def test_streaks_ignore_order_and_same_day_repeats(self):
+        engine = SmartSchedulingEngine()
+        # Jan 1-3 run, a gap on Jan 4, then Jan 5-6; Jan 2 appears twice and the rows are shuffled
+        created = ['2024-01-05T10:00:00', '2024-01-02T08:00:00', '2024-01-01T09:00:00',
+                   '2024-01-06T19:00:00', '2024-01-02T21:00:00', '2024-01-03T12:00:00']
+        columns = engine._extract_session_columns([{'created_at': value} for value in created])
+
+        consistency = engine._analyze_study_consistency(columns)
+
+        assert consistency['max_streak'] == 3
+        assert consistency['current_streak'] == 2
+        assert consistency['study_days'] == 5
+        assert consistency['confidence'] == pytest.approx(0.3)
+
+    def test_single_study_day_is_a_streak_of_one(self):
+        engine = SmartSchedulingEngine()
+        columns = engine._extract_session_columns([
+            {'created_at': '2024-01-02T08:00:00'},
+            {'created_at': '2024-01-02T21:00:00'},
+        ])
+
+        consistency = engine._analyze_study_consistency(columns)
+
+        assert (consistency['current_streak'], consistency['max_streak'], consistency['study_days']) == (1, 1, 1)
+
+
+class TestPreferredDays:
+
+    MONDAY = date(2024, 1, 1)
+    SATURDAY = date(2024, 1, 6)
+
+    @pytest.mark.parametrize('days_of_week, monday, saturday', [
+        pytest.param(None, True, False, id='default-weekdays'),
+        pytest.param([6, 7], False, True, id='weekends'),
+        pytest.param(['1', '6'], True, True, id='string-days'),
+        pytest.param([], True, True, id='no-restriction'),
+    ])
+    def test_days_of_week_drive_the_mask(self, days_of_week, monday, saturday):
+        preferences = StudyReminderPreferences(user_id=SCHEDULE_USER_ID)
+        if days_of_week is not None:
+            preferences.days_of_week = days_of_week
+        engine = SmartSchedulingEngine()
+
+        assert engine._is_preferred_day(self.MONDAY, preferences) is monday
+        assert engine._is_preferred_day(self.SATURDAY, preferences) is saturday
+
+    def test_days_cannot_change_behind_the_mask(self):
+        preferences = StudyReminderPreferences(user_id=SCHEDULE_USER_ID, days_of_week=[1, 2, 3, 4, 5])
+
+        with pytest.raises(AttributeError):
+            preferences.days_of_week.append(6)
+        preferences.days_of_week = [*preferences.days_of_week, 6]
+
+        assert SmartSchedulingEngine()._is_preferred_day(self.SATURDAY, preferences)
@@ -1,46 +1,54 @@
 import pytest
+from datetime import datetime
+from types import MappingProxyType, SimpleNamespace
 from unittest.mock import patch, MagicMock
 
 from app.models import Topic
 
 
+# Canonical Supabase topics row, built once and read-only so no test can mutate it for the others
+_TOPIC_ROW = MappingProxyType({
+    'id': '550e8400-e29b-41d4-a716-446655440099',
+    'title': 'Test Topic',
+    'description': 'Test Description',
+    'user_id': 'test-user-id',
+    'created_at': '2024-01-01T00:00:00',
+    'is_active': True,
+    'share_code': None,
+    'is_shared': False,
+    'shared_at': None,
+    'notes': None,
+    'tags': [],
+    'version': 1,
+    'last_modified': '2024-01-01T00:00:00',
+    'is_gcse': False,
+    'gcse_subject_id': None,
+    'gcse_topic_id': None,
+    'gcse_exam_board': None,
+    'gcse_specification_code': None,
+    'exam_weight': None,
+    'parent_topic_id': None,
+})
+
+
 def _topic_row(**overrides):
-    row = {
-        'id': '550e8400-e29b-41d4-a716-446655440099',
-        'title': 'Test Topic',
-        'description': 'Test Description',
-        'user_id': 'test-user-id',
-        'created_at': '2024-01-01T00:00:00',
-        'is_active': True,
-        'share_code': None,
-        'is_shared': False,
-        'shared_at': None,
-        'notes': None,
-        'tags': [],
-        'version': 1,
-        'last_modified': '2024-01-01T00:00:00',
-        'is_gcse': False,
-        'gcse_subject_id': None,
-        'gcse_topic_id': None,
-        'gcse_exam_board': None,
-        'gcse_specification_code': None,
-        'exam_weight': None,
-        'parent_topic_id': None,
-    }
-    row.update(overrides)
-    return row
+    # The proxy only freezes the mapping, so each row still gets its own tags list
+    return {**_TOPIC_ROW, 'tags': list(_TOPIC_ROW['tags']), **overrides}
+
+
+def _set_chain(root, path, result):
+    # Make root.a().b()...z() return result, e.g. a Supabase table().select().eq()...execute() chain
+    for name in path[:-1]:
+        root = getattr(root, name).return_value
+    getattr(root, path[-1]).return_value = result
 
 
 class TestTopicModel:
 
-    @patch('app.models.SUPABASE_AVAILABLE', True)
-    @patch('app.models.get_supabase_client')
-    def test_topic_creation(self, mock_get_client):
-        mock_client = MagicMock()
-        mock_get_client.return_value = mock_client
+    def test_topic_creation(self, mock_supabase_client):
         mock_response = MagicMock()
         mock_response.data = [_topic_row()]
-        mock_client.table.return_value.insert.return_value.execute.return_value = mock_response
+        _set_chain(mock_supabase_client, ['table', 'insert', 'execute'], mock_response)
 
         topic = Topic.create('Test Topic', 'Test Description', 'test-user-id')
 
@@ -49,14 +57,10 @@ class TestTopicModel:
         assert topic.description == 'Test Description'
         assert topic.user_id == 'test-user-id'
 
-    @patch('app.models.SUPABASE_AVAILABLE', True)
-    @patch('app.models.get_supabase_client')
-    def test_get_topic_by_id(self, mock_get_client):
-        mock_client = MagicMock()
-        mock_get_client.return_value = mock_client
+    def test_get_topic_by_id(self, mock_supabase_client):
         mock_response = MagicMock()
         mock_response.data = [_topic_row()]
-        mock_client.table.return_value.select.return_value.eq.return_value.eq.return_value.eq.return_value.execute.return_value = mock_response
+        _set_chain(mock_supabase_client, ['table', 'select', 'eq', 'eq', 'eq', 'execute'], mock_response)
 
         topic = Topic.get_by_id('550e8400-e29b-41d4-a716-446655440099', 'test-user-id')
 
@@ -64,17 +68,13 @@ class TestTopicModel:
         assert topic.id == '550e8400-e29b-41d4-a716-446655440099'
         assert topic.title == 'Test Topic'
 
-    @patch('app.models.SUPABASE_AVAILABLE', True)
-    @patch('app.models.get_supabase_client')
-    def test_get_all_topics_by_user(self, mock_get_client):
-        mock_client = MagicMock()
-        mock_get_client.return_value = mock_client
+    def test_get_all_topics_by_user(self, mock_supabase_client):
         mock_response = MagicMock()
         mock_response.data = [
             _topic_row(title='Topic 1', description='Description 1', id='660e8400-e29b-41d4-a716-446655440001'),
             _topic_row(title='Topic 2', description='Description 2', id='660e8400-e29b-41d4-a716-446655440002'),
         ]
-        mock_client.table.return_value.select.return_value.eq.return_value.eq.return_value.order.return_value.execute.return_value = mock_response
+        _set_chain(mock_supabase_client, ['table', 'select', 'eq', 'eq', 'order', 'execute'], mock_response)
 
         topics = Topic.get_all_by_user('test-user-id')
 
@@ -88,8 +88,8 @@ class TestTopicRoutes:
     @patch('app.routes.topics.Topic')
     def test_list_topics_route(self, mock_topic_model, logged_in_client):
         mock_topics = [
-            MagicMock(id=1, title='Topic 1', description='Description 1'),
-            MagicMock(id=2, title='Topic 2', description='Description 2'),
+            SimpleNamespace(id=1, title='Topic 1', description='Description 1', created_at=datetime(2024, 1, 1)),
+            SimpleNamespace(id=2, title='Topic 2', description='Description 2', created_at=datetime(2024, 1, 1)),
         ]
         mock_topic_model.get_all_by_user.return_value = mock_topics
 